@@ -0,0 +1,18 @@
+"""
+朝聖之路 Camino de Santiago PowerPoint 簡報產生器
+
+    from camino import DeckConfig, build_deck
+    build_deck(DeckConfig(output="deck.pptx", dpi=150))
+
+匯入 camino 不會載入 python-pptx / Pillow / NumPy；第一次用到 build_deck 時才載入。
+"""
+from .config import DeckConfig
+
+__all__ = ["DeckConfig", "build_deck"]
+
+
+def __getattr__(name):
+    if name == "build_deck":
+        from .build import build_deck
+        return build_deck
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,7 @@
+import sys
+
+from .cli import main
+
+# spawn 啟動的 worker 也會匯入這個模組，所以一定要有 __main__ 判斷
+if __name__ == "__main__":
+    sys.exit(main())
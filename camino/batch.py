@@ -0,0 +1,101 @@
+"""
+批次建置
+一次產生多個版本的簡報（頁面比例、有無轉場、精簡版、中英文字幕……）。
+
+所有版本共用同一份圖片索引、衍生圖快取（.cache/media/）與投影片快取
+（.cache/slides/）：先在主 process 把每個版本排版一次、收集需要的衍生圖，
+去掉重複後一次平行處理完，再把各版本分給 worker process 組裝、存檔。
+版本之間相同的投影片（例如只差在有無轉場）只會建置一次。
+"""
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import BASE, DeckConfig
+from .media import parse_dpi
+
+DEFAULT_VARIANTS = os.path.join(BASE, "variants.json")
+DEFAULT_OUTPUT_DIR = os.path.join(BASE, "decks")
+
+
+def load_variants(path=DEFAULT_VARIANTS):
+    """Read a JSON list of variant definitions into (name, DeckConfig) pairs.
+
+    Each entry has a "name" plus any DeckConfig field; "dpi" also accepts the
+    preset names. Outputs default to decks/<name>.pptx, relative paths are
+    resolved against the variants file.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    variants = []
+    for entry in entries:
+        entry = dict(entry)
+        name = entry.pop("name")
+        entry["dpi"] = parse_dpi(entry.get("dpi"))
+        # 批次輸出一律串流寫出：圖片不重複壓縮，存檔快得多
+        entry.setdefault("stream", True)
+        output = entry.get("output") or os.path.join(DEFAULT_OUTPUT_DIR, name + ".pptx")
+        entry["output"] = os.path.join(base, output)
+        try:
+            variants.append((name, DeckConfig(**entry)))
+        except TypeError as e:
+            raise ValueError(f"variant {name!r}: {e}") from None
+    return variants
+
+
+# 每個 worker process 各自保留一份 ImageIndex，連續建置多個版本時不必重新讀取
+_INDEXES = {}
+
+
+def _shared_index(img_dir):
+    from .image_index import ImageIndex
+    if img_dir not in _INDEXES:
+        _INDEXES[img_dir] = ImageIndex(img_dir)
+    return _INDEXES[img_dir]
+
+
+def _build_variant(config):
+    """Worker: build one variant, returning (captured log, seconds)."""
+    from .build import build_deck
+    started = time.perf_counter()
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        build_deck(config, _shared_index(config.img_dir))
+    return log.getvalue(), time.perf_counter() - started
+
+
+def build_batch(variants, jobs=None):
+    """Build every (name, DeckConfig) in `variants`; `jobs` caps the worker processes."""
+    from dataclasses import replace
+    from .build import plan
+    from .media import render_jobs
+
+    configs = [config for _, config in variants]
+    for config in configs:
+        if isinstance(config.output, str):
+            os.makedirs(os.path.dirname(os.path.abspath(config.output)), exist_ok=True)
+
+    # 1. 排版一次，收集所有版本需要的衍生圖（以目的檔名去重）
+    pending = {}
+    for config in configs:
+        pending.update(plan(config, _shared_index(config.img_dir))[1])
+    rendered = render_jobs(list(pending.values()), jobs)
+    if rendered:
+        print(f"Prepared {rendered} images for {len(configs)} variants.")
+    for index in _INDEXES.values():
+        index.save()
+
+    # 2. 各版本交給 worker 組裝；衍生圖都已在磁碟上，worker 內不再開 process pool
+    configs = [replace(config, jobs=1) for config in configs]
+    workers = min(jobs or os.cpu_count() or 1, len(configs))
+    with (ProcessPoolExecutor(max_workers=workers) if workers > 1
+          else contextlib.nullcontext()) as pool:
+        results = pool.map(_build_variant, configs) if pool else map(_build_variant, configs)
+        for (name, config), (log, seconds) in zip(variants, results):
+            print(f"── {name} ({seconds:.2f}s)")
+            print(log, end="")
+            print(f"   → {config.output}")
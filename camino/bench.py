@@ -0,0 +1,234 @@
+"""
+建置效能基準
+分階段量測 build_deck()：讀圖片尺寸（probe）、排版（layout）、組裝投影片（slide）、
+處理圖片（render）、放進圖片（pictures）、轉場（transitions）、存檔（save），
+另外記錄記憶體高峰（tracemalloc 與 RSS）、.pptx 大小與其中圖片的總位元組數。
+tracemalloc 會拖慢配置記憶體的程式碼，所以它的高峰在另一次建置裡量，計時與 RSS 的
+那次不開 tracemalloc。
+
+情境：
+- repo：img/ 裡的照片
+- album-N：img/ 再加上 N 張合成照片排進相簿投影片（快取於 .cache/bench/），
+  例如 album-100 / album-1000 / album-5000
+
+每個情境在獨立的 process 裡執行，記憶體高峰互不影響；結果與 bench-baseline.json
+比較，超過 THRESHOLDS 的容許範圍就算退步。時間和機器有關（基準是在某一台機器上記錄的），
+所以時間變慢預設只警告；記憶體與檔案大小才會讓指令失敗。
+"""
+import contextlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .config import BASE, CACHE, IMG, DeckConfig
+
+BASELINE = os.path.join(BASE, "bench-baseline.json")
+ALBUM_DIR = os.path.join(CACHE, "bench")
+CASES = ["repo", "album-100", "album-1000"]
+PHASES = ["probe", "layout", "slide", "render", "pictures", "transitions", "save"]
+
+# 比基準多出多少比例算退步；時間另有絕對下限，避免幾毫秒的雜訊造成誤判
+THRESHOLDS = {"time": 0.25, "memory": 0.20, "size": 0.02}
+MIN_TIME_DELTA = 0.05
+# 只警告、不算失敗的項目（cli 的 --strict-time 會把時間也算進去）
+ADVISORY = ("time",)
+# 相簿每頁平均至少要放幾張照片，否則大相簿的頁數會失控（slides.GALLERY_PER_PAGE）
+MIN_PHOTOS_PER_PAGE = 6
+# 合成照片：長邊像素與長寬比
+ALBUM_EDGE = 480
+ALBUM_RATIOS = [4 / 3, 3 / 4, 3 / 2, 2 / 3, 16 / 9, 1.0]
+
+
+# ══════════════════════════════════════════════════════════════
+# Synthetic albums
+# ══════════════════════════════════════════════════════════════
+
+def _synthetic_photo(rng, path):
+    import numpy as np
+    from PIL import Image
+    ratio = rng.choice(ALBUM_RATIOS)
+    w, h = (ALBUM_EDGE, round(ALBUM_EDGE / ratio)) if ratio >= 1 else (round(ALBUM_EDGE * ratio), ALBUM_EDGE)
+    # 兩個顏色之間的斜向漸層加一點雜訊，壓縮後的大小接近一般照片縮圖
+    a, b = (np.array([rng.randrange(256) for _ in range(3)], dtype=np.float32) for _ in range(2))
+    t = (np.add.outer(np.linspace(0, 1, h), np.linspace(0, 1, w)) / 2)[..., None]
+    noise = np.random.default_rng(rng.randrange(1 << 32)).normal(0, 12, (h, w, 1))
+    pixels = np.clip(a * (1 - t) + b * t + noise, 0, 255).astype(np.uint8)
+    Image.fromarray(pixels).save(path, "JPEG", quality=80)
+
+
+def synthetic_album(count):
+    """Folder with img/'s files plus `count` generated photos; returns (path, their names)."""
+    root = os.path.join(ALBUM_DIR, "album-%d" % count)
+    names = ["g%05d.jpg" % i for i in range(1, count + 1)]
+    done = os.path.join(root, ".complete")
+    if not os.path.exists(done):
+        shutil.rmtree(root, ignore_errors=True)
+        os.makedirs(root)
+        for name in os.listdir(IMG):
+            if not name.startswith("."):
+                shutil.copy2(os.path.join(IMG, name), root)
+        rng = random.Random(count)
+        for name in names:
+            _synthetic_photo(rng, os.path.join(root, name))
+        open(done, "w").close()
+    return root, names
+
+
+# ══════════════════════════════════════════════════════════════
+# One case (runs in its own process)
+# ══════════════════════════════════════════════════════════════
+
+def _media_bytes(path):
+    import zipfile
+    with zipfile.ZipFile(path) as z:
+        return sum(i.file_size for i in z.infolist() if i.filename.startswith("ppt/media/"))
+
+
+def _rss_peak():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 的 ru_maxrss 以 KB 為單位，macOS 是 bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _gallery_stats(names, pages):
+    last = pages[-1].pictures if pages else ()
+    # 最後一列：最後一頁上和最後一張照片同一個 top 的照片
+    last_row = sum(1 for p in last if p[2] == last[-1][2])
+    return {"photos": len(names), "pages": len(pages), "last_row": last_row}
+
+
+def run_case(case, jobs=None, trace=False):
+    """Build the deck for `case` once and return its measurements.
+
+    With `trace`, the build runs under tracemalloc and only
+    {"memory": {"tracemalloc_peak": ...}} is returned.
+    """
+    import tracemalloc
+    from . import slides
+    from .build import build_deck
+    from .image_index import ImageIndex
+    from .timing import record, totals
+
+    if case == "repo":
+        img_dir = IMG
+    else:
+        img_dir, names = synthetic_album(int(case.split("-", 1)[1]))
+        slides.GALLERY[:] = names
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "deck.pptx")
+        # 尺寸索引與快取都從空的開始，量到的是完整的冷建置
+        index = ImageIndex(img_dir, sidecar=os.path.join(tmp, "index.json"))
+        config = DeckConfig(output=output, img_dir=img_dir, cache_dir=tmp,
+                            jobs=jobs, use_cache=False)
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        with record() as spans, contextlib.redirect_stdout(sys.stderr):
+            build_deck(config, index)
+        total = time.perf_counter() - started
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return {"memory": {"tracemalloc_peak": peak}}
+        phases = totals(spans)
+        return {
+            "slides": sum(1 for s in spans if s.name == "slide"),
+            "gallery": _gallery_stats(slides.GALLERY, slides.gallery_layout()),
+            "time": dict({p: round(phases.get(p, 0.0), 4) for p in PHASES}, total=round(total, 4)),
+            "slowest_slides": [[s.args["slide"], round(s.end - s.start, 4)] for s in
+                               sorted((s for s in spans if s.name == "slide"),
+                                      key=lambda s: s.start - s.end)[:5]],
+            "memory": {"rss_peak": _rss_peak()},
+            "size": {"pptx": os.path.getsize(output), "media": _media_bytes(output)},
+        }
+
+
+# ══════════════════════════════════════════════════════════════
+# Suite and baseline comparison
+# ══════════════════════════════════════════════════════════════
+
+def _run_isolated(case, jobs, trace):
+    cmd = [sys.executable, "-m", "camino.bench", case, str(jobs or 0)]
+    if trace:
+        cmd.append("--trace")
+    proc = subprocess.run(cmd, cwd=BASE, stdout=subprocess.PIPE, check=True)
+    return json.loads(proc.stdout)
+
+
+def run_suite(cases=CASES, jobs=None):
+    """{case: measurements}, each case built in a fresh interpreter: once for
+    time and RSS, once more under tracemalloc."""
+    results = {}
+    for case in cases:
+        results[case] = _run_isolated(case, jobs, trace=False)
+        results[case]["memory"].update(_run_isolated(case, jobs, trace=True)["memory"])
+    return results
+
+
+def compare(results, baseline, thresholds=THRESHOLDS):
+    """[(case, metric, base, current, regressed?)] for every metric in both."""
+    rows = []
+    for case, current in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        for group in ("time", "memory", "size"):
+            for metric, value in current[group].items():
+                old = base.get(group, {}).get(metric)
+                if old is None:
+                    continue
+                limit = old * (1 + thresholds[group])
+                regressed = value > limit
+                if group == "time":
+                    regressed = regressed and value - old > MIN_TIME_DELTA
+                rows.append((case, "%s.%s" % (group, metric), old, value, regressed))
+    return rows
+
+
+def failures(rows, strict_time=False):
+    """The regressed rows of compare() that fail the run; ADVISORY groups only
+    count with `strict_time`."""
+    return [r for r in rows if r[4] and (strict_time or r[1].split(".")[0] not in ADVISORY)]
+
+
+def layout_checks(results, minimum=MIN_PHOTOS_PER_PAGE):
+    """[(case, problem)] for galleries that end in a one-photo row, and album
+    cases averaging fewer than `minimum` photos per page."""
+    problems = []
+    for case, current in results.items():
+        gallery = current.get("gallery")
+        if not gallery or not gallery["pages"]:
+            continue
+        if gallery["photos"] > 1 and gallery.get("last_row") == 1:
+            problems.append((case, "the last gallery row holds a single photo"))
+        per_page = gallery["photos"] / gallery["pages"]
+        if case.startswith("album-") and per_page < minimum:
+            problems.append((case, "%.1f photos per gallery page (expected ≥ %d)" % (per_page, minimum)))
+    return problems
+
+
+def load_baseline(path=BASELINE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_results(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    # python -m camino.bench <case> [jobs] [--trace]：run_suite() 的子 process（jobs 0 = 自動）
+    argv = [a for a in sys.argv[1:] if a != "--trace"]
+    json.dump(run_case(argv[0], (int(argv[1]) or None) if len(argv) > 1 else None,
+                       trace="--trace" in sys.argv), sys.stdout)
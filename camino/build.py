@@ -0,0 +1,229 @@
+"""
+簡報建置流程
+排版（收集圖片）→ 平行前處理圖片 → 單執行緒組裝 → 存檔；
+輸入沒變的投影片直接從快取還原。
+"""
+import hashlib
+import inspect
+import json
+import os
+
+import pptx
+from pptx import Presentation
+
+from . import content, layout, slides
+from .config import DeckConfig, load_captions, source_files
+from .image_index import ImageIndex
+from .layout import expand, select_slides
+from .media import MediaCache
+from .pptx_writer import (normalize_rels, package_digest, package_entries, reproducible_time,
+                          set_core_properties, stable_media, write_package)
+from .slide_cache import SlideCache, builder_key
+from .timing import span
+
+
+def layout_fingerprint(media, config):
+    """Hash of everything besides a builder's own source that shapes its output.
+
+    投影片快取的鍵 = builder 自己的原始碼（文字、座標都寫在裡面）
+                  + 這個指紋（其餘程式碼、圖片處理設定、頁面比例、文字對照表）；
+    圖片內容則另外比對 SHA-1。轉場不存進快取，所以有無轉場的版本共用同一份。
+    """
+    h = hashlib.sha1()
+    builder_sources = [inspect.getsource(builder) for builder, _ in layout.SLIDES]
+    for path in source_files():
+        with open(path, encoding="utf-8") as f:
+            src = f.read()
+        if os.path.samefile(path, slides.__file__):
+            for builder_src in builder_sources:
+                src = src.replace(builder_src, "")
+        h.update(src.encode("utf-8"))
+    h.update(("%s/%s/%s" % (media.dpi, media.quality, pptx.__version__)).encode())
+    if config.aspect != "16:9":
+        h.update(config.aspect.encode())
+    if layout.CAPTIONS:
+        h.update(json.dumps(layout.CAPTIONS, sort_keys=True).encode("utf-8"))
+    if layout.ALT_TEXTS:
+        h.update(json.dumps(layout.ALT_TEXTS, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def slide_key(builder, spec, fingerprint):
+    """Cache key of one slide; a page's spec (e.g. its picture boxes) is part of it."""
+    source = inspect.getsource(builder)
+    if spec is not None:
+        source += "\0" + repr(spec)
+    return builder_key(source, fingerprint)
+
+
+def _build(builder, slide, spec):
+    if spec is None:
+        builder(slide)
+    else:
+        builder(slide, spec)
+
+
+def _setup(config, index=None):
+    index = index or ImageIndex(config.img_dir)
+    media = MediaCache(index, os.path.join(config.cache_dir, "media"),
+                       dpi=config.dpi, quality=config.quality)
+    prs = Presentation()
+    stable_media(prs)
+    layout.begin(prs, index, media, config.aspect, load_captions(config.lang),
+                 content.captions(content.load()))
+    cache = SlideCache(os.path.join(config.cache_dir, "slides"), index)
+    return prs, index, media, cache
+
+
+def _record_path(config):
+    key = hashlib.sha1(os.path.abspath(config.output).encode("utf-8")).hexdigest()
+    return os.path.join(config.cache_dir, "outputs", key + ".json")
+
+
+def _unchanged(config, digest):
+    """Whether config.output is the file last written with `digest`, untouched since."""
+    try:
+        with open(_record_path(config), encoding="utf-8") as f:
+            record = json.load(f)
+        st = os.stat(config.output)
+    except (OSError, ValueError):
+        return False
+    return record == {"digest": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _remember(config, digest):
+    path = _record_path(config)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    st = os.stat(config.output)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"digest": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}, f)
+
+
+def save(prs, config):
+    """Write the deck to config.output; returns False when it was left as is.
+
+    Reproducible decks get fixed timestamps and document properties, so the
+    same inputs give the same bytes; when the content digest matches the file
+    written last time (and that file was not touched since) nothing is written.
+    """
+    normalize_rels(prs)
+    stream = config.stream or config.output == "-"
+    if not config.reproducible:
+        if stream:
+            write_package(prs, config.output)
+        else:
+            prs.save(config.output)
+        return True
+    when = reproducible_time()
+    set_core_properties(prs, when)
+    if not isinstance(config.output, str) or config.output == "-":
+        write_package(prs, config.output, when, compress_media=not stream)
+        return True
+    # XML 只序列化一次，算雜湊與寫檔共用
+    entries = list(package_entries(prs))
+    digest = package_digest(entries, when.isoformat(), stream)
+    if _unchanged(config, digest):
+        return False
+    write_package(prs, config.output, when, compress_media=not stream, entries=entries)
+    _remember(config, digest)
+    return True
+
+
+def build_deck(config=None, index=None, extra_jobs=()):
+    """Build the deck described by `config` (a DeckConfig).
+
+    Returns (output, written): `written` is False when the file on disk already
+    held this exact deck and was left as is.
+
+    `index` lets several builds in one process share an ImageIndex;
+    `extra_jobs` are other derivatives (e.g. the website's) rendered in the
+    same pass as the deck's, so a photo both need is decoded only once.
+    """
+    config = config or DeckConfig()
+    with span("setup"):
+        prs, index, media, cache = _setup(config, index)
+        fingerprint = layout_fingerprint(media, config)
+    selected = select_slides(config.slides)
+
+    built = []
+    deck = []
+    for builder, transition, spec, label in expand(selected):
+        with span("slide", slide=label):
+            key = slide_key(builder, spec, fingerprint)
+            slide = layout.new_slide()
+            deck.append((slide, transition))
+            if config.use_cache:
+                with span("restore"):
+                    restored = cache.restore(key, slide)
+                if restored:
+                    continue
+            layout.USED_IMAGES.clear()
+            with span("build"):
+                _build(builder, slide, spec)
+            built.append((key, slide, list(layout.USED_IMAGES)))
+
+    # 平行前處理：解碼、裁切、縮圖、壓縮；再由單執行緒把圖片放進投影片
+    with span("render"):
+        rendered = media.render_pending(config.jobs, extra_jobs)
+    if rendered:
+        print(f"Prepared {rendered} images.")
+    with span("pictures"):
+        layout.flush_pictures()
+    with span("cache"):
+        for key, slide, images in built:
+            cache.store(key, slide, images)
+    if config.transitions:
+        with span("transitions"):
+            for slide, transition in deck:
+                layout.add_transition(slide, *transition)
+    print(f"Built {len(built)} slides, reused {len(deck) - len(built)} from cache.")
+
+    with span("save"):
+        written = save(prs, config)
+        if not written:
+            print("Deck unchanged since the last build, not rewritten.")
+    with span("index"):
+        index.save()
+    return config.output, written
+
+
+def plan(config=None, index=None):
+    """Lay out every slide without processing images or writing anything.
+
+    Returns (rows, jobs): one row per slide — (number, builder name, cached?,
+    images, new derivatives to render, error message or None) — and the
+    derivative jobs (dst → job) the uncached slides still need.
+    """
+    config = config or DeckConfig()
+    prs, index, media, cache = _setup(config, index)
+    fingerprint = layout_fingerprint(media, config)
+    rows = []
+    jobs = {}
+    try:
+        planned = list(expand(select_slides(config.slides)))
+    except (OSError, ValueError) as e:
+        # 分頁需要圖片尺寸；缺檔時整組投影片無法排版
+        return [(0, "-", False, [], 0, str(e))], jobs
+    for n, (builder, transition, spec, label) in enumerate(planned, 1):
+        key = slide_key(builder, spec, fingerprint)
+        cached = config.use_cache and os.path.exists(os.path.join(cache.cache_dir, key + ".json"))
+        layout.USED_IMAGES.clear()
+        error = None
+        try:
+            _build(builder, layout.new_slide(), spec)
+        except (OSError, ValueError) as e:
+            error = str(e)
+        # 有快取的投影片直接還原，不需要它的衍生圖
+        queued = media.take_pending()
+        if not cached:
+            jobs.update(queued)
+        rows.append((n, label, cached, list(layout.USED_IMAGES),
+                     0 if cached else len(queued), error))
+    layout.PENDING.clear()
+    index.save()
+    return rows, jobs
+
+
+def dry_run(config=None):
+    """Rows of plan() for `config`."""
+    return plan(config)[0]
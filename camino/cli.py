@@ -0,0 +1,435 @@
+"""
+命令列入口：python -m camino <command>
+
+只有 build / dry-run / batch（以及 serve 的建置子 process）會載入 python-pptx、Pillow 等套件；
+--help 與 list-slides 不需要它們，幾毫秒就能完成。
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from dataclasses import replace
+
+from .config import BASE, DEFAULT_OUTPUT, SOURCE_LANG, DeckConfig, snapshot
+from .curate import THRESHOLD as CURATE_THRESHOLD
+from .media import DEFAULT_QUALITY, DPI_PRESETS, parse_dpi
+
+
+def _add_media_options(parser):
+    parser.add_argument("--dpi", metavar="DPI",
+                        help="依放置尺寸重新取樣圖片：%s 或數字；省略則嵌入原圖"
+                             % " / ".join("%s=%d" % kv for kv in DPI_PRESETS.items()))
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY,
+                        help="重新取樣時的 JPEG 品質（預設 %(default)s）")
+
+
+def _add_variant_options(parser):
+    parser.add_argument("--aspect", choices=["16:9", "4:3"], default="16:9",
+                        help="頁面比例；4:3 會把版面等比縮小置中，背景鋪滿整頁")
+    parser.add_argument("--lang", default=SOURCE_LANG,
+                        help="文字語言：zh 或 camino/captions/ 下的對照表，例如 en")
+    parser.add_argument("--no-transitions", action="store_true", help="不加轉場效果")
+    parser.add_argument("--slides", metavar="NAME,...",
+                        help="只放這些投影片（list-slides 列出的名稱，以逗號分隔）")
+
+
+def _config(args, **overrides):
+    return DeckConfig(dpi=parse_dpi(args.dpi), quality=args.quality,
+                      aspect=args.aspect, lang=args.lang,
+                      transitions=not args.no_transitions,
+                      slides=args.slides.split(",") if args.slides else None,
+                      **overrides)
+
+
+# ══════════════════════════════════════════════════════════════
+# build
+# ══════════════════════════════════════════════════════════════
+
+def watch(argv, interval=1.0):
+    """Rebuild in a fresh process whenever img/ or the slide definitions change."""
+    cmd = [sys.executable, "-m", "camino", "build"] + argv
+    last = None
+    try:
+        while True:
+            snap = snapshot()
+            if snap != last:
+                if last is not None:
+                    changed = sorted(p for p in set(snap) | set(last) if snap.get(p) != last.get(p))
+                    print("Changed: " + ", ".join(os.path.relpath(p, BASE) for p in changed))
+                started = time.perf_counter()
+                subprocess.run(cmd, cwd=BASE)
+                print(f"Rebuilt in {time.perf_counter() - started:.2f}s, watching for changes…")
+                last = snapshot()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_build(args):
+    if args.watch:
+        watch([a for a in args.argv if a != "--watch"])
+        return 0
+    if args.preview:
+        return cmd_preview(args)
+    output = args.output
+    if output == "-":
+        # stdout 留給 .pptx 內容，進度訊息改印到 stderr
+        output = sys.stdout.buffer
+        args.stream = True
+        sys.stdout = sys.stderr
+
+    from .build import build_deck
+    config = _config(args, output=output, jobs=args.jobs,
+                     use_cache=not args.no_cache, stream=args.stream,
+                     reproducible=not args.no_reproducible)
+    if args.profile:
+        from .timing import profile
+        with profile(args.profile, args.profile_python, args.profile_memory) as profiles:
+            _, written = build_deck(config)
+    else:
+        _, written = build_deck(config)
+    # 內容沒變時 build_deck 已經說明沒有重寫，不再印「saved to」
+    if args.output != "-" and written:
+        print(f"PowerPoint saved to: {args.output}")
+    if args.profile:
+        print("Profile written to: " + ", ".join(profiles))
+    return 0
+
+
+def cmd_preview(args):
+    from .preview import build_preview
+    started = time.perf_counter()
+    sheet, report = build_preview(_config(args, jobs=args.jobs), args.preview, args.preview_width,
+                                  pages=args.preview_pages)
+    for label, overflow in report:
+        if overflow:
+            print(f"{label}: {overflow} text box(es) may overflow")
+    print(f"Previewed {len(report)} slides in {time.perf_counter() - started:.2f}s: {sheet}")
+    return 0
+
+
+# ══════════════════════════════════════════════════════════════
+# list-slides / dry-run
+# ══════════════════════════════════════════════════════════════
+
+def slide_title(builder):
+    """Title from the '# SLIDE N: …' banner above a builder."""
+    import inspect
+    for line in (inspect.getcomments(builder) or "").splitlines():
+        if line.startswith("# SLIDE"):
+            return line.split(":", 1)[1].strip()
+    return builder.__name__
+
+
+def cmd_list_slides(args):
+    from .layout import SLIDES
+    from . import slides  # noqa: F401  (registers the builders)
+    for n, (builder, (trans_type, speed)) in enumerate(SLIDES, 1):
+        print(f"{n:>3}  {builder.__name__:<18} {trans_type + '/' + speed:<14} {slide_title(builder)}")
+    return 0
+
+
+def cmd_dry_run(args):
+    from .build import dry_run
+    failed = 0
+    rows = dry_run(_config(args))
+    for n, name, cached, images, derivatives, error in rows:
+        status = "cached" if cached else "build"
+        detail = ", ".join(images) or "-"
+        if derivatives:
+            detail += f"  (+{derivatives} derivatives)"
+        if error:
+            failed += 1
+            detail = "ERROR " + error
+        print(f"{n:>3}  {name:<18} {status:<7} {detail}")
+    print(f"{len(rows)} slides, {sum(r[2] for r in rows)} cached, {failed} with errors.")
+    return 1 if failed else 0
+
+
+# ══════════════════════════════════════════════════════════════
+# batch
+# ══════════════════════════════════════════════════════════════
+
+def cmd_batch(args):
+    from .batch import build_batch, load_variants
+    variants = load_variants(args.variants)
+    if args.only:
+        names = {name for name, _ in variants}
+        unknown = sorted(set(args.only) - names)
+        if unknown:
+            print("Unknown variants: " + ", ".join(unknown), file=sys.stderr)
+            return 2
+        variants = [(name, config) for name, config in variants if name in args.only]
+    if args.no_cache:
+        variants = [(name, replace(config, use_cache=False)) for name, config in variants]
+    started = time.perf_counter()
+    build_batch(variants, args.jobs)
+    print(f"Built {len(variants)} variants in {time.perf_counter() - started:.2f}s.")
+    return 0
+
+
+# ══════════════════════════════════════════════════════════════
+# serve
+# ══════════════════════════════════════════════════════════════
+
+def cmd_serve(args):
+    from .server import serve
+    build_args = ["--quality", str(args.quality)]
+    if args.dpi:
+        build_args += ["--dpi", args.dpi]
+    serve(args.host, args.port, build_args)
+    return 0
+
+
+# ══════════════════════════════════════════════════════════════
+# site
+# ══════════════════════════════════════════════════════════════
+
+def cmd_site(args):
+    from .site import build_site
+    started = time.perf_counter()
+    out_dir = build_site(args.output, args.jobs)
+    print(f"Site written to {out_dir} in {time.perf_counter() - started:.2f}s.")
+    return 0
+
+
+# ══════════════════════════════════════════════════════════════
+# all
+# ══════════════════════════════════════════════════════════════
+
+def cmd_all(args):
+    from .pipeline import build_all
+    started = time.perf_counter()
+    output, written, out_dir, warnings = build_all(
+        _config(args, output=args.output, jobs=args.jobs, use_cache=not args.no_cache),
+        args.site_output, args.jobs)
+    for warning in warnings:
+        print("Warning: " + warning)
+    if written:
+        print(f"PowerPoint saved to: {output}")
+    print(f"Site written to {out_dir}; both built in {time.perf_counter() - started:.2f}s.")
+    return 0
+
+
+# ══════════════════════════════════════════════════════════════
+# optimize-images
+# ══════════════════════════════════════════════════════════════
+
+def cmd_optimize_images(args):
+    from .optimize import optimize_dir
+    started = time.perf_counter()
+    rows = optimize_dir(args.directory, args.jobs)
+    for name, before, after, notes in rows:
+        print(f"{name:<16} {before / 1024:8.1f} KB → {after / 1024:8.1f} KB  {', '.join(notes) or '-'}")
+    before = sum(r[1] for r in rows)
+    after = sum(r[2] for r in rows)
+    saved = 100 * (before - after) / before if before else 0
+    skipped = sum(1 for r in rows if r[3] and r[3][0].startswith("skipped"))
+    print(f"{len(rows)} images: {before / 1024:.1f} KB → {after / 1024:.1f} KB (-{saved:.1f}%) "
+          f"in {time.perf_counter() - started:.2f}s."
+          + (f" {skipped} unreadable file(s) skipped, left as is." if skipped else ""))
+    return 0
+
+
+# ══════════════════════════════════════════════════════════════
+# curate
+# ══════════════════════════════════════════════════════════════
+
+def cmd_curate(args):
+    from .config import IMG
+    from .content import save_gallery
+    from .curate import curate, photos
+    from .image_index import ImageIndex
+    started = time.perf_counter()
+    index = ImageIndex(IMG)
+    names = photos(IMG) if args.all else (args.photos or None)
+    try:
+        clusters = curate(index, names, threshold=args.threshold, jobs=args.jobs)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 2
+    for c in clusters:
+        if len(c.members) > 1:
+            print(f"{c.best:<16} ← " + ", ".join(n for n in c.members if n != c.best))
+    count = sum(len(c.members) for c in clusters)
+    print(f"{count} photos → {len(clusters)} kept in {time.perf_counter() - started:.2f}s.")
+    if not args.dry_run:
+        save_gallery([c.best for c in clusters], args.output)
+        print(f"Gallery written to: {args.output}")
+    return 0
+
+
+# ══════════════════════════════════════════════════════════════
+# bench
+# ══════════════════════════════════════════════════════════════
+
+def cmd_bench(args):
+    from .bench import (THRESHOLDS, compare, failures, layout_checks, load_baseline, run_suite,
+                        save_results)
+    cases = args.cases.split(",")
+    results = run_suite(cases, args.jobs)
+    for case, r in results.items():
+        t = r["time"]
+        print(f"{case:<12} {r['slides']:>4} slides  {t['total']:7.2f}s  "
+              + "  ".join(f"{p} {t[p]:.2f}" for p in t if p != "total"))
+        print(f"{'':<12} peak {r['memory']['tracemalloc_peak'] / 2**20:.1f} MB traced / "
+              f"{r['memory']['rss_peak'] / 2**20:.1f} MB RSS, "
+              f".pptx {r['size']['pptx'] / 2**20:.1f} MB ({r['size']['media'] / 2**20:.1f} MB media)")
+    layout = layout_checks(results)
+    for case, problem in layout:
+        print(f"LAYOUT {case}: {problem}")
+    if args.output:
+        save_results(results, args.output)
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_results(baseline, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 1 if layout else 0
+
+    thresholds = dict(THRESHOLDS)
+    if args.time_tolerance is not None:
+        thresholds["time"] = args.time_tolerance
+    rows = compare(results, load_baseline(args.baseline), thresholds)
+    failed = failures(rows, args.strict_time)
+    for row in rows:
+        case, metric, old, new, regressed = row
+        if regressed:
+            label = "REGRESSION" if row in failed else "WARNING (time depends on the machine)"
+            print(f"{label} {case} {metric}: {old} → {new} (+{100 * (new - old) / old:.0f}%)")
+    if not rows:
+        print("No baseline to compare against; run with --update-baseline to record one.")
+    else:
+        warnings = sum(1 for r in rows if r[4]) - len(failed)
+        print(f"{len(rows)} metrics compared, {len(failed)} regressions, {warnings} timing warnings.")
+    return 1 if failed or layout else 0
+
+
+# ══════════════════════════════════════════════════════════════
+# Main
+# ══════════════════════════════════════════════════════════════
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = argparse.ArgumentParser(prog="camino", description="朝聖之路 PowerPoint 簡報產生器")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="產生 .pptx 簡報")
+    _add_media_options(p)
+    _add_variant_options(p)
+    p.add_argument("-j", "--jobs", type=int, default=None,
+                   help="平行處理圖片的 process 數（預設為 CPU 核心數）")
+    p.add_argument("--no-cache", action="store_true",
+                   help="忽略投影片快取，全部重新建置")
+    p.add_argument("--watch", action="store_true",
+                   help="監看 img/ 與投影片定義，有變動就自動重新建置")
+    p.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                   help="輸出檔案；\"-\" 代表寫到 stdout（預設 %(default)s）")
+    p.add_argument("--stream", action="store_true",
+                   help="逐一串流寫出 part，圖片不重複壓縮（輸出到 stdout 時自動開啟）")
+    p.add_argument("--no-reproducible", action="store_true",
+                   help="zip 時間戳記用目前時間，內容沒變也照樣重寫輸出檔")
+    p.add_argument("--profile", nargs="?", const=os.path.join(BASE, ".cache", "profile"),
+                   metavar="DIR",
+                   help="把各階段的時間寫成 trace.json（chrome://tracing 或 ui.perfetto.dev 開啟），"
+                        "預設寫到 .cache/profile/")
+    p.add_argument("--profile-python", action="store_true",
+                   help="搭配 --profile：另存 cProfile 結果 build.prof")
+    p.add_argument("--profile-memory", action="store_true",
+                   help="搭配 --profile：另存 tracemalloc 快照 memory.tracemalloc")
+    p.add_argument("--preview", nargs="?", const=os.path.join(BASE, ".cache", "preview"),
+                   metavar="DIR",
+                   help="不產生 .pptx，改用 Pillow 把每張投影片畫成小 PNG 與總覽圖 sheet.png，"
+                        "預設寫到 .cache/preview/")
+    p.add_argument("--preview-width", type=int, default=480, metavar="PX",
+                   help="搭配 --preview：每張投影片的寬度（預設 %(default)s 像素）")
+    p.add_argument("--preview-pages", action="store_true",
+                   help="搭配 --preview：另外把每張投影片各存成 NN-名稱.png")
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("list-slides", help="列出所有投影片與轉場")
+    p.set_defaults(func=cmd_list_slides)
+
+    p = sub.add_parser("dry-run", help="只排版並檢查圖片，不處理圖片也不寫檔")
+    _add_media_options(p)
+    _add_variant_options(p)
+    p.set_defaults(func=cmd_dry_run)
+
+    p = sub.add_parser("batch", help="依 variants.json 一次產生多個版本")
+    p.add_argument("variants", nargs="?", default=os.path.join(BASE, "variants.json"),
+                   help="版本定義檔（預設 %(default)s）")
+    p.add_argument("--only", nargs="+", metavar="NAME", help="只建置這些版本")
+    p.add_argument("-j", "--jobs", type=int, default=None,
+                   help="平行建置的 process 數（預設為 CPU 核心數）")
+    p.add_argument("--no-cache", action="store_true",
+                   help="忽略投影片快取，全部重新建置")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("site", help="產生可部署的網站（index.html + 響應式圖片）到 dist/")
+    p.add_argument("-o", "--output", default=os.path.join(BASE, "dist"),
+                   help="輸出資料夾（預設 %(default)s）")
+    p.add_argument("-j", "--jobs", type=int, default=None,
+                   help="平行處理圖片的 process 數（預設為 CPU 核心數）")
+    p.set_defaults(func=cmd_site)
+
+    p = sub.add_parser("all", help="一次產生簡報與網站：照片只解碼一次，圖說都來自 note.md")
+    _add_media_options(p)
+    _add_variant_options(p)
+    p.add_argument("-j", "--jobs", type=int, default=None,
+                   help="平行處理圖片的 process 數（預設為 CPU 核心數）")
+    p.add_argument("--no-cache", action="store_true",
+                   help="忽略投影片快取，全部重新建置")
+    p.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                   help="簡報輸出檔案（預設 %(default)s）")
+    p.add_argument("--site-output", default=os.path.join(BASE, "dist"),
+                   help="網站輸出資料夾（預設 %(default)s）")
+    p.set_defaults(func=cmd_all)
+
+    p = sub.add_parser("optimize-images", help="無損壓縮照片並去掉中繼資料（就地改寫）")
+    p.add_argument("directory", nargs="?", default=os.path.join(BASE, "img"),
+                   help="照片資料夾（預設 %(default)s）")
+    p.add_argument("-j", "--jobs", type=int, default=None,
+                   help="平行處理圖片的 process 數（預設為 CPU 核心數）")
+    p.set_defaults(func=cmd_optimize_images)
+
+    p = sub.add_parser("curate", help="找出幾乎相同的照片，每組留最清晰的一張，寫成相簿清單 gallery.json")
+    p.add_argument("photos", nargs="*", metavar="PHOTO",
+                   help="img/ 裡的候選照片（預設為 gallery.json 目前的清單）")
+    p.add_argument("--all", action="store_true", help="以 img/ 裡所有 JPEG 為候選")
+    p.add_argument("-o", "--output", default=os.path.join(BASE, "gallery.json"),
+                   help="相簿清單（預設 %(default)s）")
+    p.add_argument("--threshold", type=int, default=CURATE_THRESHOLD,
+                   help="128 位元感知雜湊最多幾個位元不同算同一組（預設 %(default)s）")
+    p.add_argument("-j", "--jobs", type=int, default=None,
+                   help="平行解碼照片的 process 數（預設為 CPU 核心數）")
+    p.add_argument("--dry-run", action="store_true", help="只列出分組，不寫檔")
+    p.set_defaults(func=cmd_curate)
+
+    p = sub.add_parser("bench", help="分階段量測建置時間、記憶體與檔案大小，並與基準比較")
+    p.add_argument("--cases", default="repo,album-100,album-1000",
+                   help="要量測的情境，以逗號分隔：repo 或 album-<張數>，"
+                        "例如 album-5000（預設 %(default)s）")
+    p.add_argument("-j", "--jobs", type=int, default=None,
+                   help="平行處理圖片的 process 數（預設為 CPU 核心數）")
+    p.add_argument("-o", "--output", help="把這次的結果寫成 JSON")
+    p.add_argument("--baseline", default=os.path.join(BASE, "bench-baseline.json"),
+                   help="基準檔（預設 %(default)s）")
+    p.add_argument("--update-baseline", action="store_true",
+                   help="把這次的結果寫進基準檔，不做比較")
+    p.add_argument("--time-tolerance", type=float, default=None,
+                   help="時間可以比基準慢多少比例（預設 0.25）")
+    p.add_argument("--strict-time", action="store_true",
+                   help="時間變慢也算失敗（基準在同一台機器上記錄時才用）")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("serve", help="提供 /deck.pptx 下載服務（由 nginx 反向代理）")
+    _add_media_options(p)
+    p.set_defaults(dpi="screen")
+    p.add_argument("--host", default="127.0.0.1", help="監聽位址（預設 %(default)s）")
+    p.add_argument("--port", type=int, default=8000, help="監聽埠（預設 %(default)s）")
+    p.set_defaults(func=cmd_serve)
+
+    args = parser.parse_args(argv)
+    args.argv = argv[1:]
+    return args.func(args)
@@ -0,0 +1,66 @@
+"""
+建置設定與專案路徑
+"""
+import json
+import os
+from dataclasses import dataclass
+
+from .media import DEFAULT_QUALITY
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE = os.path.dirname(PACKAGE_DIR)
+IMG = os.path.join(BASE, "img")
+CACHE = os.path.join(BASE, ".cache")
+CAPTIONS_DIR = os.path.join(PACKAGE_DIR, "captions")
+DEFAULT_OUTPUT = os.path.join(BASE, "朝聖之路.pptx")
+# slides.py 中的文字以繁體中文撰寫，其他語言由 captions/<lang>.json 對照
+SOURCE_LANG = "zh"
+
+
+@dataclass
+class DeckConfig:
+    """Everything build_deck() needs; the defaults reproduce `python create_pptx.py`."""
+    output: object = DEFAULT_OUTPUT   # path, binary file object or "-" for stdout
+    img_dir: str = IMG
+    cache_dir: str = CACHE
+    dpi: int | None = None            # None embeds the original photos
+    quality: int = DEFAULT_QUALITY
+    jobs: int | None = None           # image worker processes, None = one per core
+    use_cache: bool = True
+    stream: bool = False
+    reproducible: bool = True         # same inputs → same bytes; an unchanged deck is not rewritten
+    aspect: str = "16:9"              # "16:9" or "4:3", see layout.ASPECTS
+    lang: str = SOURCE_LANG           # caption set, see load_captions()
+    transitions: bool = True
+    slides: list | None = None        # builder names to include, None = all
+
+
+def source_files():
+    """Python sources of this package; editing them can change the deck."""
+    return sorted(os.path.join(PACKAGE_DIR, n)
+                  for n in os.listdir(PACKAGE_DIR) if n.endswith(".py"))
+
+
+def snapshot(img_dir=IMG):
+    """(mtime, size) of the package sources, caption catalogs, note.md, gallery.json
+    and every photo in img/."""
+    paths = source_files()
+    paths += [os.path.join(CAPTIONS_DIR, n) for n in os.listdir(CAPTIONS_DIR)]
+    paths += [os.path.join(BASE, "note.md"), os.path.join(BASE, "gallery.json")]
+    paths += [os.path.join(img_dir, n) for n in os.listdir(img_dir) if not n.startswith(".")]
+    snap = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        snap[path] = (st.st_mtime_ns, st.st_size)
+    return snap
+
+
+def load_captions(lang):
+    """Caption catalog (source text → translation) for `lang`."""
+    if lang == SOURCE_LANG:
+        return {}
+    with open(os.path.join(CAPTIONS_DIR, lang + ".json"), encoding="utf-8") as f:
+        return json.load(f)
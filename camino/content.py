@@ -0,0 +1,94 @@
+"""
+內容模型
+note.md 是照片註解的唯一來源：每一段以「檔名[, 檔名…]: 說明」開頭，
+下一段之前的非空行都接在說明後面；標題（# …）與其他文字略過。
+
+簡報把說明寫進圖片的替代文字，網站寫成燈箱的圖說（data-caption）；
+check() 列出 note.md、img/ 與頁面之間對不上的照片。
+
+gallery.json 是相簿的照片清單（依順序，`python -m camino curate` 產生，也可以手改）：
+簡報的相簿投影片與網站的 .gallery-grid 都照它排。
+"""
+import json
+import os
+import re
+from collections import namedtuple
+
+from .config import BASE
+
+NOTE = os.path.join(BASE, "note.md")
+GALLERY = os.path.join(BASE, "gallery.json")
+
+# 一段註解：照片檔名（依出現順序）與說明
+Entry = namedtuple("Entry", "photos caption")
+
+_HEAD = re.compile(r"^\s*((?:[\w-]+\.(?:jpe?g|png))(?:\s*[,，]\s*[\w-]+\.(?:jpe?g|png))*)\s*[:：]\s*(.*)$",
+                   re.I)
+
+
+def parse(text):
+    """[Entry] in the order they appear in `text`."""
+    entries = []
+    photos, lines = None, []
+    for line in text.splitlines() + [""]:
+        m = _HEAD.match(line)
+        if m or not line.strip() or line.lstrip().startswith("#"):
+            if photos:
+                entries.append(Entry(photos, "\n".join(lines)))
+            photos, lines = None, []
+        if m:
+            photos = re.split(r"\s*[,，]\s*", m.group(1))
+            lines = [m.group(2).strip()] if m.group(2).strip() else []
+        elif photos is not None and line.strip():
+            lines.append(line.strip())
+    return entries
+
+
+def load(path=NOTE):
+    """[Entry] of `path`, or [] when it does not exist."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return parse(f.read())
+    except FileNotFoundError:
+        return []
+
+
+def load_gallery(path=GALLERY):
+    """Photo names of the gallery in order, or [] when `path` does not exist."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def save_gallery(names, path=GALLERY):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(names, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def captions(entries):
+    """{photo name: caption}; a photo in several entries keeps the first one."""
+    out = {}
+    for entry in entries:
+        for photo in entry.photos:
+            out.setdefault(photo, entry.caption)
+    return out
+
+
+MISSING = "note.md not found: no captions on the site and no alt text in the deck"
+
+
+def check(entries, photos, shown, path=NOTE):
+    """Warnings for a missing note.md and for annotated photos missing from img/ or never shown.
+
+    `photos` are the files in img/, `shown` the ones an output actually uses.
+    """
+    if not os.path.exists(path):
+        return [MISSING]
+    annotated = captions(entries)
+    warnings = ["note.md: %s is not in img/" % n for n in annotated if n not in photos]
+    warnings += ["note.md: %s is annotated but never shown" % n
+                 for n in annotated if n in photos and n not in shown]
+    return warnings
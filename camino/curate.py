@@ -0,0 +1,252 @@
+"""
+相簿挑片
+一趟旅程動輒幾千張照片，連拍又多；這裡找出幾乎相同的照片，每組只留最清晰的一張，
+結果寫成 gallery.json，簡報的相簿投影片與網站的 .gallery-grid 都從那裡讀取。
+候選照片預設是 gallery.json 目前的清單（也可以指定 img/ 裡的照片或全部照片），
+照片一律放在 img/，gallery.json 裡只寫檔名。
+
+- 每張照片算兩個 64 位元的感知雜湊：dHash（相鄰像素的明暗梯度）與 pHash（DCT 低頻係數），
+  合成 128 位元；清晰度是拉普拉斯運算結果的變異數（影像縮到固定大小後再算，不同解析度可比較）。
+  解碼在 process pool 平行進行，每張只取小灰階圖，雜湊再以 NumPy 整批計算。
+- 結果以原圖內容 SHA-1 為鍵快取在 .cache/phash.json，再跑一次不必解碼任何照片。
+- 相似的照片用多重索引雜湊（multi-index hashing）找：128 位元切成 8 段各自分桶，
+  只比較至少有一段幾乎相同的照片，不必兩兩比對；距離在門檻內的照片連成同一組
+  （union-find，整批以 NumPy 合併，已同組的照片不再比較）。
+"""
+import itertools
+import json
+import math
+import os
+from collections import namedtuple
+
+from . import content
+from .config import CACHE
+
+STATE = os.path.join(CACHE, "phash.json")
+# 128 位元（pHash + dHash）中最多幾個位元不同算是同一組
+THRESHOLD = 24
+# 清晰度計算用的長邊像素數；pHash 用 32×32 灰階圖、dHash 用 9×8
+SHARPNESS_PX = 480
+_PHASH_PX = 32
+_DHASH_W, _DHASH_H = 9, 8
+# 每次交給 worker 的照片數
+_POOL_CHUNK = 16
+# 多重索引雜湊每個區塊的位元數：pHash 與 dHash 各一個位元組
+_CHUNK_BITS = 16
+_WORD = (1 << 64) - 1
+
+# 一組幾乎相同的照片：留下的那張與整組照片（依檔名排序）
+Cluster = namedtuple("Cluster", "best members")
+
+
+# ══════════════════════════════════════════════════════════════
+# Hashing
+# ══════════════════════════════════════════════════════════════
+
+def _features(path):
+    """(32×32 gray, 9×8 gray, sharpness) of one photo, decoded at reduced scale."""
+    import numpy as np
+    from PIL import Image, ImageOps
+    with Image.open(path) as im:
+        w, h = im.size
+        f = SHARPNESS_PX / max(w, h)
+        im.draft("L", (math.ceil(w * f), math.ceil(h * f)))
+        im = ImageOps.exif_transpose(im).convert("L")
+    im.thumbnail((SHARPNESS_PX, SHARPNESS_PX), Image.BILINEAR)
+    a = np.asarray(im, dtype=np.float32)
+    laplacian = a[1:-1, :-2] + a[1:-1, 2:] + a[:-2, 1:-1] + a[2:, 1:-1] - 4 * a[1:-1, 1:-1]
+    tile = np.asarray(im.resize((_PHASH_PX, _PHASH_PX), Image.BILINEAR), dtype=np.float32)
+    small = np.asarray(im.resize((_DHASH_W, _DHASH_H), Image.BILINEAR), dtype=np.float32)
+    return tile, small, float(laplacian.var())
+
+
+def _pack(bits):
+    """N×64 booleans → [int]."""
+    import numpy as np
+    return [int(v) for v in np.packbits(bits, axis=1).view(">u8")[:, 0]]
+
+
+def dhash_batch(small):
+    """dHash of each N×8×9 gray image: is each pixel darker than its right neighbour."""
+    return _pack((small[:, :, 1:] > small[:, :, :-1]).reshape(len(small), -1))
+
+
+def _dct_matrix(n):
+    import numpy as np
+    k = np.arange(n)
+    m = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)) * math.sqrt(2 / n)
+    m[0] /= math.sqrt(2)
+    return m.astype(np.float32)
+
+
+def phash_batch(tiles):
+    """pHash of each N×32×32 gray image: the 8×8 lowest DCT frequencies vs their median."""
+    import numpy as np
+    d = _dct_matrix(tiles.shape[1])
+    low = (d @ tiles @ d.T)[:, :8, :8].reshape(len(tiles), -1)
+    # 直流分量只反映整體亮度，不參與中位數
+    median = np.median(low[:, 1:], axis=1)
+    return _pack(low > median[:, None])
+
+
+def _popcount(words):
+    """Set bits per row of an N×2 uint64 array."""
+    import numpy as np
+    if hasattr(np, "bitwise_count"):        # NumPy 2.0 起才有
+        return np.bitwise_count(words).sum(axis=1)
+    return np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1).sum(axis=1)
+
+
+def _load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
+
+
+def fingerprints(index, names, jobs=None, state_path=STATE):
+    """{name: (128-bit perceptual hash, sharpness)} for `names` in index.root."""
+    import numpy as np
+    state = _load_state(state_path)
+    digests = {name: index.digest(name) for name in names}
+    todo = sorted({d: n for n, d in digests.items() if d not in state}.items())
+    if todo:
+        paths = [os.path.join(index.root, n) for _, n in todo]
+        workers = min(jobs or os.cpu_count() or 1, len(paths))
+        if workers == 1:
+            features = list(map(_features, paths))
+        else:
+            # cli 為了 THRESHOLD 會載入這個模組，concurrent.futures 等要開 process 時才載入
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                features = list(pool.map(_features, paths, chunksize=_POOL_CHUNK))
+        tiles, small, sharpness = zip(*features)
+        phashes = phash_batch(np.stack(tiles))
+        dhashes = dhash_batch(np.stack(small))
+        for (digest, _), p, d, s in zip(todo, phashes, dhashes, sharpness):
+            state[digest] = ["%016x%016x" % (p, d), round(s, 2)]
+        _save_state(state, state_path)
+        index.save()
+    return {name: (int(state[d][0], 16), state[d][1]) for name, d in digests.items()}
+
+
+# ══════════════════════════════════════════════════════════════
+# Clustering
+# ══════════════════════════════════════════════════════════════
+
+def _flips(bits, radius):
+    """Every `bits`-bit mask with at most `radius` bits set."""
+    import numpy as np
+    out = [0]
+    for k in range(1, radius + 1):
+        out += [sum(1 << b for b in c) for c in itertools.combinations(range(bits), k)]
+    return np.array(out, dtype=np.int64)
+
+
+def _compress(parent):
+    """Point every node of the forest `parent` straight at its root."""
+    import numpy as np
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent[:] = grand
+
+
+def _union(parent, a, b):
+    """Merge the sets of every pair (a[i], b[i]); roots always point to a smaller index."""
+    import numpy as np
+    while len(a):
+        _compress(parent)
+        a, b = parent[a], parent[b]
+        keep = a != b
+        a, b = np.maximum(a[keep], b[keep]), np.minimum(a[keep], b[keep])
+        # 同一個根可能同時要接到好幾個根上，一次只接最小的，其餘下一輪再接
+        np.minimum.at(parent, a, b)
+
+
+def components(words, threshold):
+    """Root index of each row of `words` (N×2 uint64: pHash, dHash) after joining
+    every pair within `threshold` bits, transitively.
+
+    Multi-index hashing: the 128 bits are cut into 8 chunks of 16 — one byte of
+    each hash, so a featureless dHash does not make every chunk collide — and two
+    hashes at most `threshold` bits apart must have some chunk at most
+    threshold // 8 bits apart (pigeonhole). Each chunk is bucketed once and the
+    buckets a few flips away are looked up for every photo at once; only those
+    candidates, and only when not already in the same group, are compared.
+    """
+    import numpy as np
+    n = len(words)
+    parent = np.arange(n)
+    chunks = [(((words[:, 0] >> np.uint64(8 * k)) & np.uint64(0xFF)) << np.uint64(8)
+               | ((words[:, 1] >> np.uint64(8 * k)) & np.uint64(0xFF))).astype(np.int64)
+              for k in range(8)]
+    flips = _flips(_CHUNK_BITS, threshold // len(chunks))
+    for keys in chunks:
+        # 以計數排序建桶：start[k]:start[k + 1] 是 order 中區塊值為 k 的照片
+        order = np.argsort(keys, kind="stable")
+        start = np.zeros((1 << _CHUNK_BITS) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=1 << _CHUNK_BITS), out=start[1:])
+        for flip in flips:
+            query = keys ^ flip
+            lo = start[query]
+            counts = start[query + 1] - lo
+            total = int(counts.sum())
+            if not total:
+                continue
+            a = np.repeat(np.arange(n), counts)
+            b = order[np.arange(total) + np.repeat(lo - (np.cumsum(counts) - counts), counts)]
+            _compress(parent)
+            keep = (a < b) & (parent[a] != parent[b])
+            a, b = a[keep], b[keep]
+            keep = _popcount(words[a] ^ words[b]) <= threshold
+            _union(parent, a[keep], b[keep])
+    return _compress(parent)
+
+
+def cluster(hashes, threshold=THRESHOLD):
+    """Group names whose hashes are within `threshold` bits, transitively.
+
+    `hashes` is {name: hash}; returns [[name]] sorted, each group sorted.
+    """
+    import numpy as np
+    names = sorted(hashes)
+    words = np.array([[hashes[n] >> 64, hashes[n] & _WORD] for n in names], dtype=np.uint64)
+    groups = {}
+    for name, root in zip(names, components(words.reshape(-1, 2), threshold).tolist()):
+        groups.setdefault(root, []).append(name)
+    return sorted(groups.values())
+
+
+def photos(root):
+    """Every JPEG in `root`, sorted by name."""
+    return sorted(n for n in os.listdir(root)
+                  if n.lower().endswith((".jpg", ".jpeg")) and not n.startswith("."))
+
+
+def curate(index, names=None, threshold=THRESHOLD, jobs=None, state_path=STATE):
+    """[Cluster] of `names` in index.root (default: the current gallery.json list),
+    the sharpest first-choice per group, in the order of each group's first photo.
+    """
+    if names is None:
+        names = content.load_gallery()
+    missing = [n for n in names if not os.path.isfile(os.path.join(index.root, n))]
+    if missing:
+        raise FileNotFoundError("not in %s: %s" % (index.root, ", ".join(missing)))
+    names = list(dict.fromkeys(names))
+    prints = fingerprints(index, names, jobs, state_path)
+    groups = cluster({n: h for n, (h, _) in prints.items()}, threshold)
+    position = {n: i for i, n in enumerate(names)}
+    groups.sort(key=lambda g: min(position[n] for n in g))
+    # 清晰度相同時取檔名較前的（通常是先拍的那張）
+    return [Cluster(min(g, key=lambda n: (-prints[n][1], n)), g) for g in groups]
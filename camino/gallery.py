@@ -0,0 +1,129 @@
+"""
+相簿排版
+任意張數的照片依長寬比排成「左右對齊」的列（justified rows），再自動分頁。
+
+分列用線性分割的動態規劃：每一列都剛好撐滿寬度，列高則由該列照片的長寬比總和決定；
+選擇斷點使各列高度與目標列高的差距平方和最小（也就是浪費或溢出的面積最少）。
+最後一列不會被拉高，但成本仍以撐滿寬度時的高度計算，所以不會剩一張照片孤零零一列。
+每一列最多只往回看到列高低於目標一半為止，所以是 O(n·k)，一千張照片也只要幾毫秒。
+
+每頁幾列由照片數量決定（fitted_pages）：從一列開始試，頁數在預算內就用，
+照片少時每張都大，上千張的相簿則每頁多放幾列。
+
+只用到長寬比，不載入 python-pptx 或 Pillow。
+"""
+import math
+from collections import namedtuple
+
+# 一頁相簿：第幾頁、共幾頁、每張照片的 (檔名, left, top, width, height)，單位英吋
+GalleryPage = namedtuple("GalleryPage", "number count pictures")
+# fitted_pages() 最多試到每頁幾列
+MAX_ROWS = 3
+
+
+def justify(ratios, width, target_h, gap=0.0, max_h=None):
+    """Break pictures with aspect `ratios` (w/h) into rows that fill `width`.
+
+    Returns [(start, end, height)] covering ratios[start:end]. Full rows are
+    exactly `width` wide; the last row is never stretched past `target_h`, and
+    no row is taller than `max_h` (such rows are narrower and get centred).
+    """
+    n = len(ratios)
+    if n == 0:
+        return []
+    max_h = max_h or float("inf")
+    prefix = [0.0]
+    for r in ratios:
+        prefix.append(prefix[-1] + r)
+
+    inf = float("inf")
+    best = [0.0] + [inf] * n     # best[j]: lowest cost of laying out ratios[:j]
+    start = [0] * (n + 1)        # start[j]: first picture of the row ending at j
+    for j in range(1, n + 1):
+        for i in range(j - 1, -1, -1):
+            k = j - i
+            room = width - gap * (k - 1)
+            if room <= 0:
+                break
+            h = room / (prefix[j] - prefix[i])
+            if k > 1 and h < target_h / 2:
+                break            # 再多放只會更矮
+            # 成本一律用撐滿寬度時的列高（最後一列也是）：被壓矮的列留白多，不能算成剛好
+            cost = best[i] + (h - target_h) ** 2
+            if cost < best[j]:
+                best[j] = cost
+                start[j] = i
+    rows = []
+    j = n
+    while j > 0:
+        i = start[j]
+        h = (width - gap * (j - i - 1)) / (prefix[j] - prefix[i])
+        rows.append((i, j, min(h, max_h, target_h) if j == n else min(h, max_h)))
+        j = i
+    rows.reverse()
+    return rows
+
+
+def paginate(heights, capacity, gap=0.0):
+    """Group consecutive row `heights` into pages; `capacity(page_index)` is the
+    height available on each page. Returns a list of lists of row indexes."""
+    pages = [[]]
+    used = 0.0
+    for r, h in enumerate(heights):
+        page = pages[-1]
+        need = h if not page else used + gap + h
+        if page and need > capacity(len(pages) - 1) + 1e-9:
+            pages.append([r])
+            used = h
+        else:
+            page.append(r)
+            used = need
+    return pages if pages[0] else []
+
+
+def gallery_pages(names, ratios, areas, target_h=None, gap=0.2, rows=None):
+    """Lay `names` out over as many pages as needed.
+
+    `areas(page_index)` gives the (left, top, width, height) box for pictures on
+    each page. Rows are justified to the first page's width, then each page's
+    rows are centred vertically in its box. With `rows`, the row height is
+    derived from the boxes so that that many rows stack on every page.
+    Returns a list of GalleryPage.
+    """
+    left0, _, width, _ = areas(0)
+    max_h = min(areas(0)[3], areas(1)[3])
+    if rows:
+        # 每一列都不超過這個高度，每頁一定放得下 rows 列
+        target_h = max_h = (max_h - gap * (rows - 1)) / rows
+    rows = justify(ratios, width, target_h, gap, max_h)
+    heights = [h for _, _, h in rows]
+    grouped = paginate(heights, lambda p: areas(p)[3], gap)
+
+    pages = []
+    for number, row_ids in enumerate(grouped, 1):
+        left, top, width, height = areas(number - 1)
+        block = sum(heights[r] for r in row_ids) + gap * (len(row_ids) - 1)
+        y = top + (height - block) / 2
+        pictures = []
+        for r in row_ids:
+            i, j, h = rows[r]
+            row_w = sum(ratios[i:j]) * h + gap * (j - i - 1)
+            x = left + (width - row_w) / 2
+            for name, ratio in zip(names[i:j], ratios[i:j]):
+                pictures.append((name, round(x, 4), round(y, 4),
+                                 round(ratio * h, 4), round(h, 4)))
+                x += ratio * h + gap
+            y += h + gap
+        pages.append(GalleryPage(number, len(grouped), tuple(pictures)))
+    return pages
+
+
+def fitted_pages(names, ratios, areas, per_page, gap=0.2, max_rows=MAX_ROWS):
+    """gallery_pages() with the fewest rows per page (the largest pictures) that
+    still averages `per_page` pictures per page, trying up to `max_rows` rows."""
+    budget = max(1, math.ceil(len(names) / per_page))
+    for rows in range(1, max_rows + 1):
+        pages = gallery_pages(names, ratios, areas, gap=gap, rows=rows)
+        if len(pages) <= budget:
+            break
+    return pages
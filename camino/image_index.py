@@ -0,0 +1,192 @@
+"""
+圖片尺寸索引
+只讀取 JPEG / PNG 檔頭（SOF marker、IHDR）取得尺寸，並套用 EXIF orientation，
+不解碼任何像素。結果存成 sidecar 檔，以「路徑 + 檔案大小 + mtime」判斷是否失效，
+只有新增或修改過的圖片才會重新讀取檔頭。
+需要時也會記錄檔案內容的 SHA-1，作為衍生圖快取的鍵值。
+"""
+import hashlib
+import json
+import os
+import struct
+
+SIDECAR = ".image-index.json"
+VERSION = 1
+
+# SOF markers that carry frame dimensions (DHT/JPG/DAC excluded)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers without a length field
+_STANDALONE = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8}
+# EXIF orientation 5–8 → image is stored rotated by 90°, swap width/height
+_TRANSPOSED = {5, 6, 7, 8}
+
+
+def _exif_orientation(data):
+    """Return the orientation tag (0x0112) from an APP1 Exif payload, or 1."""
+    if not data.startswith(b"Exif\x00\x00") or len(data) < 14:
+        return 1
+    tiff = data[6:]
+    endian = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if endian is None:
+        return 1
+    ifd = struct.unpack(endian + "I", tiff[4:8])[0]
+    if ifd + 2 > len(tiff):
+        return 1
+    count = struct.unpack(endian + "H", tiff[ifd:ifd + 2])[0]
+    for i in range(count):
+        entry = ifd + 2 + i * 12
+        if entry + 12 > len(tiff):
+            break
+        tag, typ = struct.unpack(endian + "HH", tiff[entry:entry + 4])
+        if tag == 0x0112 and typ == 3:
+            return struct.unpack(endian + "H", tiff[entry + 8:entry + 10])[0]
+    return 1
+
+
+def _read_exact(f, n):
+    data = f.read(n)
+    if len(data) < n:
+        raise ValueError("truncated JPEG")
+    return data
+
+
+def _jpeg_size(f):
+    """Walk JPEG markers up to the first SOF; return (w, h, orientation).
+
+    Raises ValueError for files that are not JPEG or end inside a header segment.
+    """
+    orientation = 1
+    if f.read(2) != b"\xff\xd8":
+        raise ValueError("not a JPEG file")
+    while True:
+        byte = f.read(1)
+        if not byte:
+            break
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":          # fill bytes
+            marker = f.read(1)
+        if not marker:
+            break
+        marker = marker[0]
+        if marker in _STANDALONE:
+            continue
+        length = struct.unpack(">H", _read_exact(f, 2))[0]
+        if length < 2:
+            raise ValueError("corrupt JPEG segment length")
+        if marker in _SOF_MARKERS:
+            _, h, w = struct.unpack(">BHH", _read_exact(f, 5))
+            return w, h, orientation
+        if marker == 0xE1 and orientation == 1:
+            orientation = _exif_orientation(f.read(length - 2))
+            continue
+        if marker == 0xDA:                # start of scan, no SOF seen
+            break
+        f.seek(length - 2, os.SEEK_CUR)
+    raise ValueError("no SOF marker found")
+
+
+def _png_size(f):
+    """Read width/height from the PNG IHDR chunk."""
+    head = f.read(24)
+    if head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        raise ValueError("not a PNG file")
+    w, h = struct.unpack(">II", head[16:24])
+    return w, h, 1
+
+
+def probe(path):
+    """Return the display (width, height) of an image by reading only its header."""
+    with open(path, "rb") as f:
+        sig = f.read(8)
+        f.seek(0)
+        if sig[:2] == b"\xff\xd8":
+            w, h, orientation = _jpeg_size(f)
+        elif sig == b"\x89PNG\r\n\x1a\n":
+            w, h, orientation = _png_size(f)
+        else:
+            # Other formats: Pillow only parses the header on open()
+            from PIL import Image
+            with Image.open(f) as im:
+                w, h = im.size
+                orientation = im.getexif().get(0x0112, 1)
+    if orientation in _TRANSPOSED:
+        w, h = h, w
+    return w, h
+
+
+class ImageIndex:
+    """Sidecar-backed map of image name → (width, height) for one folder."""
+
+    def __init__(self, root, sidecar=SIDECAR):
+        self.root = root
+        self.path = os.path.join(root, sidecar)
+        self._entries = self._load()
+        self._fresh = {}     # name → (w, h), validated during this run
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != VERSION:
+            return {}
+        return data.get("images", {})
+
+    def size(self, name):
+        """Return (width, height) of `name`, probing the header only when stale."""
+        hit = self._fresh.get(name)
+        if hit is not None:
+            return hit
+        st = os.stat(os.path.join(self.root, name))
+        entry = self._entries.get(name)
+        if entry is None or entry["size"] != st.st_size or entry["mtime"] != st.st_mtime_ns:
+            w, h = probe(os.path.join(self.root, name))
+            entry = {"size": st.st_size, "mtime": st.st_mtime_ns, "width": w, "height": h}
+            self._entries[name] = entry
+            self._dirty = True
+        hit = self._fresh[name] = (entry["width"], entry["height"])
+        return hit
+
+    def ratio(self, name):
+        w, h = self.size(name)
+        return w / h
+
+    def digest(self, name):
+        """Return the SHA-1 of the file contents, hashed once per (size, mtime)."""
+        self.size(name)
+        entry = self._entries[name]
+        if "sha1" not in entry:
+            h = hashlib.sha1()
+            with open(os.path.join(self.root, name), "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            entry["sha1"] = h.hexdigest()
+            self._dirty = True
+        return entry["sha1"]
+
+    def save(self):
+        """Write the sidecar if anything changed, dropping entries for deleted files."""
+        present = set(os.listdir(self.root))
+        stale = [name for name in self._entries
+                 if name not in present
+                 and not os.path.exists(os.path.join(self.root, name))]
+        for name in stale:
+            del self._entries[name]
+        if not (self._dirty or stale):
+            return
+        # 每個 process 各用一個暫存檔，批次建置時多個 worker 可同時存檔
+        tmp = "%s.%d.tmp" % (self.path, os.getpid())
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": VERSION, "images": self._entries}, f,
+                          ensure_ascii=False, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            # Read-only checkout (e.g. inside a container): the index is only a cache
+            pass
+        self._dirty = False
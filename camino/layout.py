@@ -0,0 +1,416 @@
+"""
+投影片排版輔助函式
+所有圖片皆依原始比例放置，不會拉伸變形。
+
+座標一律以英吋為單位、以 16:9 的設計畫布（SLIDE_W_IN × SLIDE_H_IN）為準；
+其他比例的頁面由 begin() 設定縮放與置中位移，背景則鋪滿整頁。
+顏色以 16 進位字串表示。python-pptx 只在函式內部載入，
+所以 `camino.slides` 可以在不載入 python-pptx 的情況下列出投影片。
+"""
+import os
+from functools import lru_cache
+
+from .timing import span
+
+SLIDE_W_IN = 13.333
+SLIDE_H_IN = 7.5
+
+# 頁面比例 → 頁面尺寸（英吋）
+ASPECTS = {"16:9": (SLIDE_W_IN, SLIDE_H_IN), "4:3": (10.0, 7.5)}
+
+# ── Color Palette ──
+NAVY = "1A1A2E"
+GOLD = "C9A84C"
+GOLD_LIGHT = "E8D590"
+CREAM = "F8F4EB"
+CREAM_DARK = "EFE8D8"
+WHITE = "FFFFFF"
+TERRACOTTA = "B5561A"
+TEXT_DARK = "3A3530"
+TEXT_LIGHT = "6B6158"
+SUBTLE = "BBBBCC"
+DIM = "AAAABB"
+
+# ── Paragraph alignment ──
+LEFT = "left"
+CENTER = "center"
+RIGHT = "right"
+
+# 建置狀態：由 begin() 設定，供各 helper 共用
+PRS = None
+INDEX = None
+MEDIA = None
+PAGE_W_IN, PAGE_H_IN = ASPECTS["16:9"]
+# 設計畫布 → 頁面：縮放倍率與置中位移（英吋）
+SCALE, OFFSET_X, OFFSET_Y = 1.0, 0.0, 0.0
+# 文字對照表（原文 → 譯文）；沒有對應的文字保持原文
+CAPTIONS = {}
+# 照片說明（檔名 → 文字，來自 note.md），寫成圖片的替代文字
+ALT_TEXTS = {}
+# 圖片先在投影片上佔好位置（z-order），等所有衍生圖平行處理完才真正放進去
+PENDING = []
+# 目前這張投影片用到的原始圖片，存進投影片快取時用來檢查圖片是否改過
+USED_IMAGES = []
+# 預覽模式（begin() 沒有給 presentation）：helper 不碰 python-pptx，
+# 改把同樣的幾何記錄在 preview.Sketch 上，由 camino/preview.py 以 Pillow 畫出
+PREVIEW = False
+
+
+def begin(prs, index, media, aspect="16:9", captions=None, alt_texts=None):
+    """Point the helpers at the presentation, image index and media cache being built.
+
+    Sets the page size for `aspect` and fits the 16:9 design canvas inside it;
+    `captions` maps the texts in slides.py to the ones to show instead, and
+    `alt_texts` photo names to their descriptions. With `prs` None the
+    slides are preview sketches instead and python-pptx is never loaded.
+    """
+    global PRS, INDEX, MEDIA, PAGE_W_IN, PAGE_H_IN, SCALE, OFFSET_X, OFFSET_Y, CAPTIONS, ALT_TEXTS
+    global PREVIEW
+    if index is not INDEX:
+        fit_contain.cache_clear()
+    PRS, INDEX, MEDIA = prs, index, media
+    PREVIEW = prs is None
+    PAGE_W_IN, PAGE_H_IN = ASPECTS[aspect]
+    if not PREVIEW:
+        from pptx.util import Inches
+        prs.slide_width = Inches(PAGE_W_IN)
+        prs.slide_height = Inches(PAGE_H_IN)
+    SCALE = min(PAGE_W_IN / SLIDE_W_IN, PAGE_H_IN / SLIDE_H_IN)
+    OFFSET_X = (PAGE_W_IN - SLIDE_W_IN * SCALE) / 2
+    OFFSET_Y = (PAGE_H_IN - SLIDE_H_IN * SCALE) / 2
+    CAPTIONS = captions or {}
+    ALT_TEXTS = alt_texts or {}
+    PENDING.clear()
+    USED_IMAGES.clear()
+
+
+def frame(left, top, width, height):
+    """Map a box on the design canvas to page inches."""
+    return (OFFSET_X + left * SCALE, OFFSET_Y + top * SCALE, width * SCALE, height * SCALE)
+
+
+def _inches(left, top, width, height):
+    from pptx.util import Inches
+    return tuple(Inches(v) for v in frame(left, top, width, height))
+
+
+def _pt(points):
+    from pptx.util import Pt
+    return Pt(points * SCALE)
+
+
+def _rgb(color):
+    from pptx.dml.color import RGBColor
+    return RGBColor.from_string(color) if isinstance(color, str) else color
+
+
+def _align(alignment):
+    from pptx.enum.text import PP_ALIGN
+    return {LEFT: PP_ALIGN.LEFT, CENTER: PP_ALIGN.CENTER, RIGHT: PP_ALIGN.RIGHT}.get(alignment, alignment)
+
+
+# ══════════════════════════════════════════════════════════════
+# Helper functions
+# ══════════════════════════════════════════════════════════════
+
+def img_path(name):
+    return os.path.join(INDEX.root, name)
+
+
+def get_ratio(name):
+    """Return (width, height, w/h ratio) of an image file."""
+    with span("probe", image=name):
+        w, h = INDEX.size(name)
+    return w, h, w / h
+
+
+@lru_cache(maxsize=None)
+def fit_contain(img_name, max_w_inches, max_h_inches):
+    """Calculate (w, h) in Inches that fits inside the box while keeping aspect ratio."""
+    with span("fit_contain", image=img_name):
+        _, _, ratio = get_ratio(img_name)
+        max_w = max_w_inches
+        max_h = max_h_inches
+        # Try fitting to width
+        w = max_w
+        h = max_w / ratio
+        if h > max_h:
+            # Fit to height instead
+            h = max_h
+            w = max_h * ratio
+        return w, h
+
+
+def _describe(pic, img_name):
+    """Use the photo's description from note.md as the picture's alt text."""
+    text = ALT_TEXTS.get(img_name)
+    if text:
+        pic._element.nvPicPr.cNvPr.set("descr", CAPTIONS.get(text, text))
+
+
+def place_picture(slide, path, left, top, width, height, img_name=None):
+    """Reserve the current z-order slot on `slide` for a picture added by flush_pictures()."""
+    from lxml import etree
+    marker = etree.Comment("picture")
+    slide.shapes._spTree.insert_element_before(marker, "p:extLst")
+    PENDING.append((slide, marker, path, left, top, width, height, img_name))
+
+
+def flush_pictures():
+    """Add every reserved picture now that its file exists, in its reserved slot."""
+    from pptx.util import Inches
+    from .pptx_writer import detach_blob
+    for slide, marker, path, left, top, width, height, img_name in PENDING:
+        with span("add_picture", image=os.path.basename(path), bytes=os.path.getsize(path)):
+            pic = slide.shapes.add_picture(path, Inches(left), Inches(top),
+                                           Inches(width), Inches(height))
+        _describe(pic, img_name)
+        # 圖片內容留在磁碟上，存檔時才讀取，記憶體不隨相簿大小成長
+        detach_blob(slide.part.related_part(pic._element.blip_rId), path)
+        marker.addnext(pic._element)
+        marker.getparent().remove(marker)
+    PENDING.clear()
+
+
+def add_img_contain(slide, img_name, box_left, box_top, box_w, box_h):
+    """Add image centered inside a bounding box, maintaining aspect ratio."""
+    USED_IMAGES.append(img_name)
+    fit_w, fit_h = fit_contain(img_name, box_w, box_h)
+    # Center inside the box
+    left = box_left + (box_w - fit_w) / 2
+    top = box_top + (box_h - fit_h) / 2
+    left, top, width, height = frame(left, top, fit_w, fit_h)
+    path = MEDIA.picture(img_name, width, height)
+    if PREVIEW:
+        slide.picture(path, left, top, width, height)
+        return
+    place_picture(slide, path, left, top, width, height, img_name)
+
+
+def add_image_bg_cover(slide, img_name):
+    """Add image as slide background using 'cover' strategy.
+
+    The source is cropped to the visible slide area first (see MediaCache.cover),
+    so the picture is placed exactly on the slide instead of overflowing it.
+    Backgrounds always fill the whole page, whatever its aspect.
+    """
+    USED_IMAGES.append(img_name)
+    with span("fit_cover", image=img_name):
+        path = MEDIA.cover(img_name, PAGE_W_IN, PAGE_H_IN)
+    if PREVIEW:
+        slide.picture(path, 0, 0, PAGE_W_IN, PAGE_H_IN)
+        return
+    place_picture(slide, path, 0, 0, PAGE_W_IN, PAGE_H_IN, img_name)
+
+
+def add_image(slide, img_name, left, top, width, height):
+    """Add the original image file as-is, e.g. a QR code that must not be resampled."""
+    USED_IMAGES.append(img_name)
+    if PREVIEW:
+        left, top, width, height = frame(left, top, width, height)
+        return slide.picture(MEDIA.picture(img_name, width, height), left, top, width, height)
+    path = img_path(img_name)
+    with span("add_picture", image=img_name, bytes=os.path.getsize(path)):
+        pic = slide.shapes.add_picture(path, *_inches(left, top, width, height))
+    _describe(pic, img_name)
+    return pic
+
+
+def add_bg(slide, color):
+    if PREVIEW:
+        slide.background = color
+        return
+    bg = slide.background
+    fill = bg.fill
+    fill.solid()
+    fill.fore_color.rgb = _rgb(color)
+
+
+def add_overlay(slide, alpha=0.55):
+    if PREVIEW:
+        slide.rect(0, 0, PAGE_W_IN, PAGE_H_IN, NAVY, opacity=1 - alpha)
+        return
+    from lxml import etree
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.oxml.ns import qn
+    from pptx.util import Emu
+    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Emu(0), Emu(0),
+                                   PRS.slide_width, PRS.slide_height)
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = _rgb(NAVY)
+    sp_pr = shape._element.spPr
+    solid_fill = sp_pr.find(qn('a:solidFill'))
+    if solid_fill is not None:
+        clr_elem = solid_fill[0]
+        alpha_elem = etree.SubElement(clr_elem, qn('a:alpha'))
+        alpha_elem.set('val', str(int((1 - alpha) * 100000)))
+    shape.line.fill.background()
+
+
+def add_box(slide, left, top, width, height, fill, line=None, line_width=1):
+    """Rounded rectangle used behind quotes, verses and the QR code."""
+    if PREVIEW:
+        return slide.rect(*frame(left, top, width, height), fill, line=line,
+                          line_width=line_width * SCALE, rounded=True)
+    from pptx.enum.shapes import MSO_SHAPE
+    shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE,
+                                   *_inches(left, top, width, height))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = _rgb(fill)
+    if line is None:
+        shape.line.fill.background()
+    else:
+        shape.line.color.rgb = _rgb(line)
+        shape.line.width = _pt(line_width)
+    return shape
+
+
+def add_textbox(slide, left, top, width, height, text, font_size=18,
+                color=WHITE, bold=False, alignment=LEFT,
+                font_name="Microsoft JhengHei"):
+    if PREVIEW:
+        txBox = slide.textbox(*frame(left, top, width, height))
+        txBox.text_frame.add(CAPTIONS.get(text, text), font_size * SCALE, color, bold, alignment)
+        return txBox
+    txBox = slide.shapes.add_textbox(*_inches(left, top, width, height))
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.text = CAPTIONS.get(text, text)
+    p.font.size = _pt(font_size)
+    p.font.color.rgb = _rgb(color)
+    p.font.bold = bold
+    p.font.name = font_name
+    p.alignment = _align(alignment)
+    return txBox
+
+
+def add_para(text_frame, text, font_size=18, color=WHITE, bold=False,
+             alignment=LEFT, font_name="Microsoft JhengHei",
+             space_before=6, space_after=6):
+    """Append a paragraph; `space_before` / `space_after` are in points."""
+    if PREVIEW:
+        return text_frame.add(CAPTIONS.get(text, text), font_size * SCALE, color, bold, alignment,
+                              space_before * SCALE, space_after * SCALE)
+    p = text_frame.add_paragraph()
+    p.text = CAPTIONS.get(text, text)
+    p.font.size = _pt(font_size)
+    p.font.color.rgb = _rgb(color)
+    p.font.bold = bold
+    p.font.name = font_name
+    p.alignment = _align(alignment)
+    p.space_before = _pt(space_before)
+    p.space_after = _pt(space_after)
+    return p
+
+
+def add_gold_line(slide, left, top, width):
+    left, top, width, _ = frame(left, top, width, 0)
+    if PREVIEW:
+        slide.rect(left, top, width, 2.5 * SCALE / 72, GOLD)
+        return
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.util import Inches
+    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE,
+                                    Inches(left), Inches(top),
+                                    Inches(width), _pt(2.5))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = _rgb(GOLD)
+    shape.line.fill.background()
+
+
+def new_slide():
+    if PREVIEW:
+        from .preview import Sketch
+        return Sketch()
+    return PRS.slides.add_slide(PRS.slide_layouts[6])
+
+
+# ══════════════════════════════════════════════════════════════
+# Slide Transitions
+# ══════════════════════════════════════════════════════════════
+
+def add_transition(slide, trans_type="fade", speed="med", advance_ms=None):
+    """Add transition effect to a slide via XML.
+    trans_type: fade, push, wipe, cover, split, blinds, dissolve
+    speed: slow, med, fast
+    advance_ms: auto-advance after N milliseconds (None = click only)
+    """
+    from lxml import etree
+    from pptx.oxml.ns import qn
+    sld = slide._element
+    # Remove existing transition
+    for old in sld.findall(qn('p:transition')):
+        sld.remove(old)
+
+    trans = etree.SubElement(sld, qn('p:transition'))
+    trans.set('spd', speed)
+    trans.set('advClick', '1')
+    if advance_ms is not None:
+        trans.set('advTm', str(advance_ms))
+
+    if trans_type == "fade":
+        etree.SubElement(trans, qn('p:fade'))
+    elif trans_type == "push":
+        child = etree.SubElement(trans, qn('p:push'))
+        child.set('dir', 'l')
+    elif trans_type == "wipe":
+        child = etree.SubElement(trans, qn('p:wipe'))
+        child.set('dir', 'd')
+    elif trans_type == "cover":
+        child = etree.SubElement(trans, qn('p:cover'))
+        child.set('dir', 'l')
+    elif trans_type == "split":
+        child = etree.SubElement(trans, qn('p:split'))
+        child.set('orient', 'horz')
+        child.set('dir', 'out')
+    elif trans_type == "blinds":
+        child = etree.SubElement(trans, qn('p:blinds'))
+        child.set('dir', 'vert')
+    elif trans_type == "dissolve":
+        etree.SubElement(trans, qn('p:dissolve'))
+
+
+# ══════════════════════════════════════════════════════════════
+# Slide registry
+# ══════════════════════════════════════════════════════════════
+
+# 投影片依定義順序登記在 SLIDES：(builder, (transition, speed))
+SLIDES = []
+
+
+def slide_builder(trans_type="fade", speed="med", pages=None):
+    """Register the decorated function as the builder of the next slide.
+
+    With `pages` — a function returning one spec per slide, called once the
+    image index is available — the builder makes as many slides as there are
+    specs and is called as builder(slide, spec).
+    """
+    def register(fn):
+        fn.pages = pages
+        SLIDES.append((fn, (trans_type, speed)))
+        return fn
+    return register
+
+
+def select_slides(names=None):
+    """The registered (builder, transition) pairs named in `names`, in deck order."""
+    if names is None:
+        return list(SLIDES)
+    known = {builder.__name__ for builder, _ in SLIDES}
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        raise ValueError("unknown slides: " + ", ".join(unknown))
+    return [(b, t) for b, t in SLIDES if b.__name__ in names]
+
+
+def expand(selected):
+    """(builder, transition, spec, label) per slide; paged builders give one per page."""
+    for builder, transition in selected:
+        if builder.pages is None:
+            yield builder, transition, None, builder.__name__
+            continue
+        with span("layout", slide=builder.__name__):
+            specs = builder.pages()
+        for n, spec in enumerate(specs, 1):
+            yield builder, transition, spec, f"{builder.__name__}[{n}/{len(specs)}]"
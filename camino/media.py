@@ -0,0 +1,261 @@
+"""
+簡報用圖片處理
+依照片在投影片上實際放置的大小與目標 DPI 重新取樣、重新壓縮；
+滿版背景（cover）則先裁成投影片可見範圍，裁切位置取邊緣能量最高的區段。
+結果以「原圖內容 SHA-1 + 目標像素 + 品質」為鍵快取在 .cache/media/。
+
+排版時只登記需要的衍生圖，render_pending() 再一次交給 process pool 平行處理。
+同一張原圖的衍生圖（不論來自簡報或網站）交給同一個 worker，照片只解碼一次。
+NumPy 與 Pillow 只在真正處理圖片時才載入。
+"""
+import math
+import os
+import sys
+
+# 常用目標解析度：投影機 / 螢幕播放用 150 dpi，需要列印講義時用 220 dpi
+DPI_PRESETS = {"screen": 150, "print": 220}
+DEFAULT_QUALITY = 85
+# 縮圖分析用的最長邊像素數；邊緣能量只需要粗略的分佈
+_ANALYSIS_PX = 256
+# 每個 worker 處理這麼多張後就換新的 process，避免 Pillow 的記憶體碎片越積越多
+MAX_TASKS_PER_CHILD = 32
+# _render_group() 處理一張原圖的期間：原圖路徑 → (解碼結果, 量化表, 解碼尺寸, 是否原尺寸)
+_DECODED = None
+
+
+def parse_dpi(value):
+    """Accept a preset name ('screen', 'print') or a number; None keeps originals."""
+    if value is None:
+        return None
+    if value in DPI_PRESETS:
+        return DPI_PRESETS[value]
+    return int(value)
+
+
+def crop_size(src_w, src_h, ratio):
+    """Largest (w, h) with aspect `ratio` that fits inside the source."""
+    if src_w / src_h > ratio:
+        return max(1, round(src_h * ratio)), src_h
+    return src_w, max(1, round(src_w / ratio))
+
+
+def crop_window(im, ratio):
+    """Return the (left, top, right, bottom) crop of `im` with aspect `ratio`
+    whose edge energy (sum of |gradient| of the luminance) is highest."""
+    import numpy as np
+    src_w, src_h = im.size
+    crop_w, crop_h = crop_size(src_w, src_h, ratio)
+    if (crop_w, crop_h) == (src_w, src_h):
+        return 0, 0, src_w, src_h
+
+    small = im.convert("L")
+    small.thumbnail((_ANALYSIS_PX, _ANALYSIS_PX))
+    a = np.asarray(small, dtype=np.float32)
+    energy = np.zeros_like(a)
+    energy[:, 1:] += np.abs(np.diff(a, axis=1))
+    energy[1:, :] += np.abs(np.diff(a, axis=0))
+
+    vertical = crop_h < src_h              # overflow axis of a cover placement
+    profile = energy.sum(axis=1 if vertical else 0)
+    scale = len(profile) / (src_h if vertical else src_w)
+    span = max(1, min(len(profile), round((crop_h if vertical else crop_w) * scale)))
+
+    # Sliding-window sums via cumsum, with a mild pull towards the centre
+    c = np.concatenate(([0.0], np.cumsum(profile)))
+    sums = c[span:] - c[:-span]
+    offsets = np.arange(len(sums))
+    centre = (len(sums) - 1) / 2
+    if centre > 0:
+        sums = sums - 0.1 * sums.max() * np.abs(offsets - centre) / centre
+    start = round(int(np.argmax(sums)) / scale)
+
+    if vertical:
+        top = min(start, src_h - crop_h)
+        return 0, top, src_w, top + crop_h
+    left = min(start, src_w - crop_w)
+    return left, 0, left + crop_w, src_h
+
+
+def _decode(src, draft_size):
+    """(RGB image, JPEG quantization tables or None) of `src`.
+
+    JPEGs are decoded at the smallest 1/2, 1/4 or 1/8 scale still covering
+    `draft_size`. Inside _render_group() a previous decode of the same file
+    that is at least as large is reused; callers must not modify the image.
+    """
+    if _DECODED is not None and src in _DECODED:
+        im, qtables, decoded, full = _DECODED[src]
+        if full or (decoded[0] >= draft_size[0] and decoded[1] >= draft_size[1]):
+            return im, qtables
+    from PIL import Image, ImageOps
+    im = Image.open(src)
+    qtables = getattr(im, "quantization", None)
+    original = im.size
+    im.draft("RGB", draft_size)
+    decoded = im.size
+    im = ImageOps.exif_transpose(im)
+    if im.mode != "RGB":
+        im = im.convert("RGB")
+    if _DECODED is not None:
+        _DECODED[src] = (im, qtables, decoded, decoded == original)
+    return im, qtables
+
+
+def _transposed(src):
+    """(stored width, height, whether EXIF rotates the photo by 90°) of `src`."""
+    from PIL import Image
+    with Image.open(src) as header:
+        width, height = header.size
+        return width, height, header.getexif().get(0x0112, 1) in (5, 6, 7, 8)
+
+
+def _open_rgb(src, size):
+    """`src` upright, decoded at a reduced scale still covering the display `size`."""
+    if _transposed(src)[2]:
+        # draft() 看的是存檔方向的尺寸，直拍照片要先對調
+        size = size[1], size[0]
+    return _decode(src, size)[0]
+
+
+def _save_jpeg(im, dst, quality, qtables=None):
+    tmp = "%s.%d.tmp" % (dst, os.getpid())
+    if qtables:
+        im.save(tmp, "JPEG", qtables=qtables, optimize=True, progressive=True)
+    else:
+        im.save(tmp, "JPEG", quality=quality, optimize=True, progressive=True)
+    os.replace(tmp, dst)
+
+
+def resample(src, dst, size, quality):
+    """Decode `src`, resize it to exactly `size` px and write a JPEG to `dst`."""
+    from PIL import Image
+    im = _open_rgb(src, size)
+    if im.size != size:
+        im = im.resize(size, Image.LANCZOS)
+    _save_jpeg(im, dst, quality)
+
+
+def cover(src, dst, size, quality):
+    """Crop `src` to the aspect of `size` around its busiest region, then resize."""
+    from PIL import Image
+    width, height, transposed = _transposed(src)
+    disp_w, disp_h = (height, width) if transposed else (width, height)
+    crop_w, crop_h = crop_size(disp_w, disp_h, size[0] / size[1])
+    # Decode at reduced scale when the cropped area still covers `size`
+    f = max(size[0] / crop_w, size[1] / crop_h)
+    # A pure crop keeps the source's JPEG tables so it never grows past the original
+    im, qtables = _decode(src, (math.ceil(width * f), math.ceil(height * f)))
+    im = im.crop(crop_window(im, size[0] / size[1]))
+    if im.size != size:
+        im = im.resize(size, Image.LANCZOS)
+        qtables = None
+    _save_jpeg(im, dst, quality, qtables)
+
+
+def _render(job):
+    render, src, dst, size, quality = job
+    render(src, dst, size, quality)
+
+
+def _render_group(jobs):
+    """Render `jobs` that share one source file, decoding it once."""
+    global _DECODED
+    _DECODED = {}
+    try:
+        # 最大的先做：之後較小的衍生圖都能沿用同一次解碼
+        for job in sorted(jobs, key=lambda job: -max(job[3])):
+            _render(job)
+    finally:
+        _DECODED = None
+
+
+class MediaCache:
+    """Return the file to embed for a picture placed at a given size on a slide."""
+
+    def __init__(self, index, cache_dir, dpi=None, quality=DEFAULT_QUALITY):
+        self.index = index
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.quality = quality
+        self._pending = {}   # dst → job, rendered by render_pending()
+
+    def target_px(self, w_in, h_in):
+        return max(1, round(w_in * self.dpi)), max(1, round(h_in * self.dpi))
+
+    def picture(self, name, w_in, h_in):
+        """Path of `name` resampled for a `w_in` × `h_in` inch placement."""
+        src = os.path.join(self.index.root, name)
+        if self.dpi is None:
+            return src
+        size = self.target_px(w_in, h_in)
+        src_w, src_h = self.index.size(name)
+        if size[0] >= src_w or size[1] >= src_h:
+            # Never upscale — the original already has fewer pixels than needed
+            return src
+        return self._derive(resample, name, "", size)
+
+    def cover(self, name, w_in, h_in):
+        """Path of `name` cropped to a `w_in` × `h_in` inch cover area.
+
+        Only the visible part is kept, so the picture can be placed exactly on
+        the slide instead of overflowing it. Identical backgrounds on several
+        slides resolve to the same file and therefore to one media part.
+        """
+        src_w, src_h = self.index.size(name)
+        size = crop_size(src_w, src_h, w_in / h_in)
+        if self.dpi is not None:
+            target = self.target_px(w_in, h_in)
+            if target[0] < size[0]:
+                size = target
+        return self._derive(cover, name, "cover-", size)
+
+    def _derive(self, render, name, kind, size):
+        key = "%s-%s%dx%d-q%d.jpg" % (self.index.digest(name)[:20], kind,
+                                      size[0], size[1], self.quality)
+        dst = os.path.join(self.cache_dir, key)
+        if dst not in self._pending and not os.path.exists(dst):
+            self._pending[dst] = (render, os.path.join(self.index.root, name),
+                                  dst, size, self.quality)
+        return dst
+
+    def render_pending(self, workers=None, extra=()):
+        """Render every queued derivative plus `extra` jobs; returns how many were rendered.
+
+        Jobs are spread over a process pool (`workers` processes, default one
+        per core), one source photo per task. JPEGs are decoded in draft mode
+        and workers are recycled every MAX_TASKS_PER_CHILD photos, which keeps
+        per-worker memory bounded.
+        """
+        jobs = list(self._pending.values()) + list(extra)
+        self._pending.clear()
+        return render_jobs(jobs, workers)
+
+    def take_pending(self):
+        """Hand the queued jobs (dst → job) to the caller instead of rendering them."""
+        pending = dict(self._pending)
+        self._pending.clear()
+        return pending
+
+
+def render_jobs(jobs, workers=None):
+    """Render derivative `jobs` (see MediaCache.render_pending); returns how many."""
+    if not jobs:
+        return 0
+    for cache_dir in {os.path.dirname(job[2]) for job in jobs}:
+        os.makedirs(cache_dir, exist_ok=True)
+    groups = {}
+    for job in jobs:
+        groups.setdefault(job[1], []).append(job)
+    workers = min(workers or os.cpu_count() or 1, len(groups))
+    if workers == 1:
+        for group in groups.values():
+            _render_group(group)
+        return len(jobs)
+    # config 會載入這個模組，concurrent.futures（約 20 ms）等真的要開 process 時才載入
+    from concurrent.futures import ProcessPoolExecutor
+    # max_tasks_per_child 是 Python 3.11 才有的參數
+    options = {"max_tasks_per_child": MAX_TASKS_PER_CHILD} if sys.version_info >= (3, 11) else {}
+    with ProcessPoolExecutor(max_workers=workers, **options) as pool:
+        for _ in pool.map(_render_group, groups.values()):
+            pass
+    return len(jobs)
@@ -0,0 +1,235 @@
+"""
+照片無損最佳化
+img/ 裡的 JPEG 就地改寫，畫面上的每個像素都不變：
+
+- 去掉不影響畫面的資料：EXIF（只留 EXIF_ALLOWLIST 的說明 / 作者 / 著作權欄位）、
+  XMP、內嵌縮圖、MPF 附加影像（手機 HDR 的 gain map 等，接在主影像之後）、註解。
+  ICC 色彩描述檔與 Adobe 色彩轉換標記保留。
+- 有 jpegtran（libjpeg-turbo）時再以 -optimize -progressive 重寫 Huffman 表與漸進式掃描；
+  EXIF 方向不是 1 時順便把像素轉正（-perfect，無法無損轉換就保留方向標記）。
+- 改寫後與原圖逐像素比對，不一致就放棄改寫。
+- 以內容 SHA-1 記錄處理過的結果（.cache/optimized.json），再跑一次不會重做。
+- 截斷或損壞、讀不懂的檔案跳過並在報告中註明，原檔不動、也不記錄。
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import CACHE
+
+STATE = os.path.join(CACHE, "optimized.json")
+# 保留的 EXIF 欄位：ImageDescription、Artist、Copyright
+EXIF_ALLOWLIST = (0x010E, 0x013B, 0x8298)
+ORIENTATION = 0x0112
+# EXIF 方向 → jpegtran 的無損轉換
+_TRANSFORMS = {2: ["-flip", "horizontal"], 3: ["-rotate", "180"], 4: ["-flip", "vertical"],
+               5: ["-transpose"], 6: ["-rotate", "90"], 7: ["-transverse"], 8: ["-rotate", "270"]}
+_SOS, _EOI = 0xDA, 0xD9
+
+
+def split_jpeg(data):
+    """(header segments [(marker, bytes)] up to the first SOS, the scans up to
+    and including EOI, bytes after EOI); ValueError if `data` is not a whole JPEG."""
+    if data[:2] != b"\xff\xd8":
+        raise ValueError("not a JPEG file")
+    try:
+        return _split(data)
+    except IndexError:
+        raise ValueError("truncated JPEG") from None
+
+
+def _split(data):
+    segments = []
+    i = 2
+    while True:
+        while data[i + 1] == 0xFF:          # 填充用的 0xFF
+            i += 1
+        marker = data[i + 1]
+        length = int.from_bytes(data[i + 2:i + 4], "big")
+        segments.append((marker, data[i:i + 2 + length]))
+        i += 2 + length
+        if marker == _SOS:
+            break
+    j = i
+    while True:
+        j = data.find(b"\xff", j)
+        if j < 0:
+            raise ValueError("truncated JPEG: no EOI marker")
+        nxt = data[j + 1]
+        if nxt == _EOI:
+            return segments, data[i:j + 2], data[j + 2:]
+        if nxt == 0xFF:
+            j += 1
+        elif nxt == 0x00 or 0xD0 <= nxt <= 0xD7:        # 跳脫的 0xFF 與 RSTn
+            j += 2
+        else:                                           # 漸進式掃描之間的 DHT / SOS 等區段
+            j += 2 + int.from_bytes(data[j + 2:j + 4], "big")
+
+
+def _keep(marker, segment):
+    if marker == 0xE0:                                  # JFIF
+        return segment[4:9] == b"JFIF\x00"
+    if marker == 0xE2:                                  # ICC，不留 MPF
+        return segment[4:16] == b"ICC_PROFILE\x00"
+    if marker == 0xEE:                                  # Adobe：CMYK / YCCK 的色彩轉換
+        return True
+    return not (0xE1 <= marker <= 0xEF or marker == 0xFE)
+
+
+def allowed_exif(data, keep_orientation):
+    """Minimal EXIF APP1 segment with only the allowlisted tags, or b""."""
+    from PIL import Image
+    exif = Image.open(io.BytesIO(data)).getexif()
+    kept = Image.Exif()
+    for tag in EXIF_ALLOWLIST:
+        if exif.get(tag):
+            kept[tag] = exif[tag]
+    if keep_orientation and exif.get(ORIENTATION, 1) != 1:
+        kept[ORIENTATION] = exif[ORIENTATION]
+    if not len(kept):
+        return b""
+    payload = kept.tobytes()
+    return b"\xff\xe1" + (len(payload) + 2).to_bytes(2, "big") + payload
+
+
+def strip(data, exif=b""):
+    """`data` with only essential segments plus the `exif` APP1 segment; the
+    scans are copied untouched and anything after EOI is dropped."""
+    segments, scans, _ = split_jpeg(data)
+    out = [b"\xff\xd8"]
+    for marker, segment in segments:
+        if _keep(marker, segment):
+            out.append(segment)
+            if marker == 0xE0 and exif:         # EXIF 緊接在 JFIF 之後
+                out.append(exif)
+                exif = b""
+    if exif:
+        out.insert(1, exif)
+    out.append(scans)
+    return b"".join(out)
+
+
+def _jpegtran(data, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "in.jpg"), os.path.join(tmp, "out.jpg")
+        with open(src, "wb") as f:
+            f.write(data)
+        cmd = ["jpegtran", "-copy", "icc", "-optimize", "-progressive"] + args + ["-outfile", dst, src]
+        if subprocess.run(cmd, capture_output=True).returncode != 0:
+            return None
+        with open(dst, "rb") as f:
+            return f.read()
+
+
+def _pixels(data, transpose=True):
+    import numpy as np
+    from PIL import Image, ImageOps
+    im = Image.open(io.BytesIO(data))
+    return np.asarray(ImageOps.exif_transpose(im) if transpose else im)
+
+
+def optimize(data):
+    """(optimized bytes, notes) for the JPEG `data`; `data` itself when nothing helps."""
+    import numpy as np
+    from PIL import Image
+    segments, _, trailing = split_jpeg(data)      # 先檢查結構，損壞的檔案在這裡就報錯
+    orientation = Image.open(io.BytesIO(data)).getexif().get(ORIENTATION, 1)
+    notes = []
+    if any(not _keep(m, seg) for m, seg in segments):
+        notes.append("metadata")
+    if trailing:
+        notes.append("trailing %.1f KB" % (len(trailing) / 1024))
+
+    result = None
+    if shutil.which("jpegtran"):
+        if orientation in _TRANSFORMS:
+            rotated = _jpegtran(data, _TRANSFORMS[orientation] + ["-perfect"])
+            if rotated is not None:
+                rotated = strip(rotated, allowed_exif(data, keep_orientation=False))
+                if np.array_equal(_pixels(rotated), _pixels(data)):
+                    result = rotated
+                    notes.append("rotated")
+        if result is None:
+            optimized = _jpegtran(data, [])
+            if optimized is not None:
+                # jpegtran 只複製 ICC，允許的 EXIF 欄位從原檔補回
+                result = strip(optimized, allowed_exif(data, keep_orientation=True))
+        if result is not None:
+            notes.append("huffman+progressive")
+    if result is None:
+        result = strip(data, allowed_exif(data, keep_orientation=True))
+
+    if not np.array_equal(_pixels(result), _pixels(data)):
+        return data, ["pixel mismatch, left as is"]
+    if len(result) >= len(data):
+        return data, ["already optimal"]
+    return result, notes
+
+
+def _sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def _optimize_file(path):
+    """(bytes before, bytes after, notes, SHA-1 of the result or None when skipped)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        result, notes = optimize(data)
+    except (ValueError, OSError) as e:       # 截斷、損壞或 Pillow 讀不懂（UnidentifiedImageError）
+        return len(data), len(data), ["skipped: %s" % e], None
+    if result is not data:
+        tmp = "%s.%d.tmp" % (path, os.getpid())
+        with open(tmp, "wb") as f:
+            f.write(result)
+        os.replace(tmp, path)
+    return len(data), len(result), notes, _sha1(result)
+
+
+def optimize_dir(root, jobs=None, state_path=STATE):
+    """Optimize every JPEG in `root` in place.
+
+    Returns [(name, bytes before, bytes after, notes)]; files whose content
+    hash is already recorded in `state_path` are reported as cached, files that
+    cannot be parsed as "skipped: <reason>" and left untouched.
+    """
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            done = set(json.load(f))
+    except (OSError, ValueError):
+        done = set()
+    names = sorted(n for n in os.listdir(root) if n.lower().endswith((".jpg", ".jpeg")))
+    report = {}
+    todo = []
+    for name in names:
+        path = os.path.join(root, name)
+        with open(path, "rb") as f:
+            if _sha1(f.read()) in done:
+                size = os.path.getsize(path)
+                report[name] = (name, size, size, ["cached"])
+                continue
+        todo.append(name)
+
+    paths = [os.path.join(root, n) for n in todo]
+    workers = min(jobs or os.cpu_count() or 1, len(paths)) or 1
+    if workers == 1:
+        results = list(map(_optimize_file, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_optimize_file, paths))
+    for name, (before, after, notes, digest) in zip(todo, results):
+        report[name] = (name, before, after, notes)
+        if digest is not None:
+            done.add(digest)
+
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    tmp = "%s.%d.tmp" % (state_path, os.getpid())
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(sorted(done), f, indent=0)
+    os.replace(tmp, state_path)
+    return [report[n] for n in names]
@@ -0,0 +1,31 @@
+"""
+一次建置簡報與網站
+兩邊共用同一份 img/ 尺寸索引與 note.md 內容模型（camino/content.py）。
+網站需要的所有尺寸、格式與簡報排版登記的衍生圖合成一批，依原圖分組交給 worker，
+每張照片只解碼一次；之後簡報組裝與網站的各個步驟都只讀快取，不再碰原圖。
+"""
+import os
+
+from . import content
+from .config import IMG, DeckConfig
+
+
+def build_all(config=None, site_out=None, jobs=None):
+    """Build the deck described by `config` and the website into `site_out`.
+
+    Returns (deck output, whether it was rewritten, site directory, note.md warnings).
+    """
+    from .build import build_deck
+    from .image_index import ImageIndex
+    from .site import DIST, build_site, image_jobs, load_site
+    from .site.lqip import page_photos
+
+    config = config or DeckConfig()
+    if os.path.abspath(config.img_dir) != os.path.abspath(IMG):
+        raise ValueError("the website is always built from img/")
+    index = ImageIndex(config.img_dir)
+    site = load_site(jobs, index)
+    output, written = build_deck(config, index, extra_jobs=image_jobs(site))
+    out_dir = build_site(site_out or DIST, jobs, index)
+    warnings = content.check(content.load(), set(os.listdir(IMG)), set(page_photos(site)))
+    return output, written, out_dir, warnings
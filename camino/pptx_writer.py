@@ -0,0 +1,212 @@
+"""
+串流式 .pptx 寫出
+python-pptx 的 prs.save() 會把所有圖片留在記憶體，並把早已壓縮過的 JPEG 再 deflate 一次。
+這裡改成逐一把 part 寫進 zip：XML 照常壓縮，圖片等媒體以 ZIP_STORED 原樣存入，
+而且圖片內容平常留在磁碟上（LazyImagePart），寫出時才分段讀取。
+輸出可以是路徑、file object，或 "-" 代表 stdout。
+
+可重現輸出：同樣的輸入每次都寫出位元組完全相同的檔案——
+- 圖片 part 以內容 SHA-1 命名（stable_media()），不受加入順序（重建或從快取還原）影響；
+  python-pptx 原本每加一張圖都要掃過整個 package 找名稱與重複圖片，照片多時是 O(n²)
+- 投影片的 rId 依 XML 中出現的順序重新編號（normalize_rels()），part 的寫出順序也就固定
+- zip 內的時間戳記與文件屬性用固定時間（SOURCE_DATE_EPOCH，沒設定時為 1980-01-01）
+package_digest() 不必寫檔就能算出內容雜湊，build 用它判斷輸出是否與上次相同。
+"""
+import datetime
+import hashlib
+import os
+import shutil
+import sys
+import time
+import zipfile
+
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.oxml.ns import qn
+from pptx.package import _ImageParts
+from pptx.parts.image import Image, ImagePart
+
+# Content types that are already compressed; deflating them again only costs CPU
+_MEDIA_PREFIXES = ("image/", "video/", "audio/")
+# Attributes that hold relationship ids inside part XML
+REL_ATTRS = (qn("r:embed"), qn("r:link"), qn("r:id"))
+
+
+class LazyImagePart(ImagePart):
+    """ImagePart whose bytes stay in a file until something asks for them."""
+
+    @property
+    def _blob(self):
+        with open(self._path, "rb") as f:
+            return f.read()
+
+    @property
+    def sha1(self):
+        return self._sha1
+
+
+def detach_blob(part, path):
+    """Drop the in-memory bytes of image `part`; they are re-read from `path`."""
+    if isinstance(part, LazyImagePart) or not isinstance(part, ImagePart):
+        return
+    sha1 = part.sha1
+    part.__class__ = LazyImagePart
+    part.__dict__.pop("_blob", None)
+    part._path = path
+    part._sha1 = sha1
+
+
+# ══════════════════════════════════════════════════════════════
+# Stable media naming and relationship ids
+# ══════════════════════════════════════════════════════════════
+
+class _StableImageParts(_ImageParts):
+    """Image parts named after their content and looked up by SHA-1 in a dict."""
+
+    def __init__(self, package):
+        super().__init__(package)
+        self._by_sha1 = {}
+
+    def get_or_add_image_part(self, image_file):
+        image = Image.from_file(image_file)
+        part = self._by_sha1.get(image.sha1)
+        if part is None:
+            partname = PackURI("/ppt/media/image-%s.%s" % (image.sha1[:16], image.ext))
+            part = ImagePart(partname, image.content_type, self._package, image.blob, image.filename)
+            self._by_sha1[image.sha1] = part
+        return part
+
+
+def stable_media(prs):
+    """Make `prs` name new image parts by content instead of by sequence number."""
+    package = prs.part.package
+    package.__dict__["_image_parts"] = _StableImageParts(package)
+
+
+def _renumber(part):
+    rels = part.rels._rels                  # rId → _Relationship
+    referenced = {}                         # 依第一次出現的順序
+    for el in part._element.iter():
+        for attr in REL_ATTRS:
+            rid = el.get(attr)
+            if rid in rels:
+                referenced.setdefault(rid, None)
+    # 沒有在 XML 裡出現的（例如版面配置）排在前面，依類型與目標排序
+    others = sorted((rid for rid in rels if rid not in referenced),
+                    key=lambda rid: (rels[rid].reltype, rels[rid].target_ref))
+    order = others + list(referenced)
+    new_ids = {old: "rId%d" % n for n, old in enumerate(order, 1)}
+    if list(rels) == order and all(old == new for old, new in new_ids.items()):
+        return
+    for el in part._element.iter():
+        for attr in REL_ATTRS:
+            rid = el.get(attr)
+            if rid in new_ids:
+                el.set(attr, new_ids[rid])
+    renumbered = [rels[old] for old in order]
+    rels.clear()
+    for rel in renumbered:
+        rel._rId = new_ids[rel._rId]
+        rels[rel._rId] = rel
+
+
+def normalize_rels(prs):
+    """Renumber every slide's rIds in document order.
+
+    A slide built from scratch gets its picture rIds in the order the pictures
+    were added, one restored from the slide cache in the cache's order; after
+    this both are the same, and so is the order parts are written in.
+    """
+    for slide in prs.slides:
+        _renumber(slide.part)
+
+
+def set_core_properties(prs, when):
+    """Fixed document properties: created / modified at `when`, revision 1."""
+    props = prs.core_properties
+    props.created = props.modified = when.replace(tzinfo=None)
+    props.last_modified_by = "camino"
+    props.revision = 1
+
+
+def reproducible_time():
+    """UTC datetime of SOURCE_DATE_EPOCH, or 1980-01-01 (the earliest a zip can store)."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc)
+    return datetime.datetime(1980, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+# ══════════════════════════════════════════════════════════════
+# Writing
+# ══════════════════════════════════════════════════════════════
+
+def _is_media(part):
+    return part.content_type.startswith(_MEDIA_PREFIXES)
+
+
+def package_entries(prs):
+    """(member name, bytes or media part) of every zip entry, in writing order."""
+    package = prs.part.package
+    parts = list(package.iter_parts())
+    yield CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts))
+    yield PACKAGE_URI.rels_uri.membername, package._rels.xml
+    for part in parts:
+        # XML parts are serialized one at a time, right before they are written
+        yield part.partname.membername, part if _is_media(part) else part.blob
+        if part._rels:
+            yield part.partname.rels_uri.membername, part.rels.xml
+
+
+def package_digest(entries, *settings):
+    """SHA-256 over package_entries() `entries`, without writing them.
+
+    Media parts contribute their SHA-1 rather than their bytes, so nothing is
+    read from disk; `settings` are the writer options that change the bytes.
+    """
+    h = hashlib.sha256(repr(settings).encode())
+    for name, data in entries:
+        h.update(name.encode() + b"\0")
+        if isinstance(data, ImagePart):
+            h.update(data.sha1.encode())
+        else:
+            h.update(hashlib.sha1(data if isinstance(data, bytes) else data.blob).hexdigest().encode())
+    return h.hexdigest()
+
+
+def _info(name, date_time, compress_type):
+    info = zipfile.ZipInfo(name, date_time=date_time)
+    info.compress_type = compress_type
+    info.create_system = 3                  # 不論在哪個平台寫出都一樣
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def _write_media(zf, info, part):
+    path = getattr(part, "_path", None)
+    if path is None:
+        zf.writestr(info, part.blob)
+        return
+    info.file_size = os.path.getsize(path)
+    with open(path, "rb") as src, zf.open(info, "w") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+
+def write_package(prs, target, date_time=None, compress_media=False, entries=None):
+    """Write `prs` to `target` (path, binary file object or "-" for stdout).
+
+    Entries are dated `date_time` (a datetime; default now). Media is stored
+    as is unless `compress_media`, which deflates it like prs.save() does.
+    `entries` reuses a list from package_entries() instead of serializing again.
+    """
+    if target == "-":
+        target = sys.stdout.buffer
+    stamp = (date_time.timetuple() if date_time else time.localtime())[:6]
+    media_type = zipfile.ZIP_DEFLATED if compress_media else zipfile.ZIP_STORED
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in entries or package_entries(prs):
+            if isinstance(data, bytes):
+                zf.writestr(_info(name, stamp, zipfile.ZIP_DEFLATED), data)
+            else:
+                _write_media(zf, _info(name, stamp, media_type), data)
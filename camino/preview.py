@@ -0,0 +1,246 @@
+"""
+快速預覽
+調整版面時不必每次都產生 .pptx：layout 的 helper 在預覽模式下（begin() 沒有給
+presentation）把同樣的幾何記錄在 Sketch 上——圖片的位置與大小一樣來自 fit_contain()、
+滿版背景一樣用 MediaCache.cover() 的裁切，文字框、金線、遮罩也是同一組座標——
+再以 Pillow 把每張投影片畫成小 PNG，並拼成一張總覽圖。
+
+圖片用預覽解析度的衍生圖（快取於 .cache/preview/media/，第一次之後不再解碼原圖）；
+文字只畫成近似的色塊：依字型大小估計每行寬度並折行，估計的高度超出文字框時框線標成紅色。
+整個過程不載入 python-pptx。
+"""
+import math
+import os
+import re
+import unicodedata
+from collections import namedtuple
+
+from . import content, layout
+from .config import CACHE, DeckConfig, load_captions
+
+DEFAULT_DIR = os.path.join(CACHE, "preview")
+# 每張投影片的寬度（像素）與總覽圖每列幾張
+WIDTH = 480
+COLUMNS = 4
+_GAP = 8
+_QUALITY = 80
+# python-pptx 文字框的預設內距（英吋）與行高倍率
+_INSET_X, _INSET_Y = 0.1, 0.05
+_LINE_HEIGHT = 1.2
+_OVERFLOW = (220, 40, 40, 255)
+
+Picture = namedtuple("Picture", "path left top width height")
+Rect = namedtuple("Rect", "left top width height fill opacity line line_width rounded")
+# 一段文字；字型大小與段落間距都是點數
+Paragraph = namedtuple("Paragraph", "text size color bold alignment space_before space_after")
+
+
+class TextBox:
+    """A text box; it is its own text_frame so add_para() can append to it."""
+
+    def __init__(self, left, top, width, height):
+        self.left, self.top, self.width, self.height = left, top, width, height
+        self.paragraphs = []
+        self.text_frame = self
+
+    def add(self, text, size, color, bold, alignment, space_before=0, space_after=0):
+        p = Paragraph(text, size, color, bold, alignment, space_before, space_after)
+        self.paragraphs.append(p)
+        return p
+
+
+class Sketch:
+    """What the layout helpers drew on one slide, in page inches, in z-order."""
+
+    def __init__(self):
+        self.background = layout.WHITE
+        self.shapes = []
+
+    def picture(self, path, left, top, width, height):
+        self.shapes.append(Picture(path, left, top, width, height))
+
+    def rect(self, left, top, width, height, fill, opacity=1.0, line=None, line_width=1,
+             rounded=False):
+        self.shapes.append(Rect(left, top, width, height, fill, opacity, line, line_width, rounded))
+
+    def textbox(self, left, top, width, height):
+        box = TextBox(left, top, width, height)
+        self.shapes.append(box)
+        return box
+
+
+# ══════════════════════════════════════════════════════════════
+# Text metrics
+# ══════════════════════════════════════════════════════════════
+
+def _char_width(ch, size):
+    """Approximate advance of `ch` in points: CJK full width, Latin about half."""
+    if unicodedata.east_asian_width(ch) in "WF":
+        return size
+    return size * (0.3 if ch.isspace() else 0.55)
+
+
+def wrap(text, size, width, bold=False):
+    """[line width in points] of `text` wrapped into `width` points.
+
+    CJK text may break anywhere, Latin text only between words.
+    """
+    factor = 1.05 if bold else 1.0
+    widths = []
+    for line in text.split("\n"):
+        current = 0.0
+        for token in re.findall(r"[^\s\u2e80-\uffff]+\s*|\s+|.", line):
+            w = sum(_char_width(ch, size) for ch in token) * factor
+            if current and current + w > width:
+                widths.append(current)
+                current = 0.0
+            current += w
+            while current > width:          # 比整行還長的字
+                widths.append(width)
+                current -= width
+        widths.append(current)
+    return widths
+
+
+# ══════════════════════════════════════════════════════════════
+# Rendering
+# ══════════════════════════════════════════════════════════════
+
+def _color(hex_color, alpha=255):
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4)) + (alpha,)
+
+
+def _box(shape, ppi):
+    return (round(shape.left * ppi), round(shape.top * ppi),
+            round((shape.left + shape.width) * ppi), round((shape.top + shape.height) * ppi))
+
+
+def _draw_text(draw, box, ppi):
+    """Paragraphs as bars of their colour; returns whether the text runs past the box."""
+    pt = ppi / 72
+    inner = (box.width - 2 * _INSET_X) * 72
+    y = (box.top + _INSET_Y) * ppi
+    for n, p in enumerate(box.paragraphs):
+        if n:
+            y += p.space_before * pt
+        line_h = p.size * _LINE_HEIGHT * pt
+        for w in wrap(p.text, p.size, inner, p.bold):
+            if w:
+                x = (box.left + _INSET_X) * ppi
+                if p.alignment == layout.CENTER:
+                    x += (inner - w) * pt / 2
+                elif p.alignment == layout.RIGHT:
+                    x += (inner - w) * pt
+                bar = p.size * (0.6 if p.bold else 0.45) * pt
+                mid = y + line_h / 2
+                draw.rectangle((round(x), round(mid - bar / 2), round(x + w * pt), round(mid + bar / 2)),
+                               fill=_color(p.color))
+            y += line_h
+        y += p.space_after * pt
+    return y > (box.top + box.height) * ppi + 1
+
+
+def render(sketch, width=WIDTH):
+    """RGB image of `sketch` that is `width` pixels wide.
+
+    Returns (image, overflowing text boxes).
+    """
+    from PIL import Image, ImageDraw
+    ppi = width / layout.PAGE_W_IN
+    size = (width, round(layout.PAGE_H_IN * ppi))
+    im = Image.new("RGBA", size, _color(sketch.background))
+    draw = ImageDraw.Draw(im)
+    overflow = []
+    for shape in sketch.shapes:
+        box = _box(shape, ppi)
+        if isinstance(shape, Picture):
+            w, h = max(1, box[2] - box[0]), max(1, box[3] - box[1])
+            with Image.open(shape.path) as pic:
+                pic.draft("RGB", (w, h))
+                pic = pic.convert("RGB")
+                if pic.size != (w, h):
+                    pic = pic.resize((w, h), Image.BILINEAR)
+                im.paste(pic, box[:2])
+        elif isinstance(shape, Rect):
+            fill = _color(shape.fill, round(shape.opacity * 255))
+            outline = _color(shape.line) if shape.line else None
+            stroke = max(1, round(shape.line_width * ppi / 72)) if shape.line else 0
+            layer = im if shape.opacity >= 1 else Image.new("RGBA", size, (0, 0, 0, 0))
+            pen = draw if layer is im else ImageDraw.Draw(layer)
+            if shape.rounded:
+                radius = round(min(box[2] - box[0], box[3] - box[1]) / 6)
+                pen.rounded_rectangle(box, radius, fill=fill, outline=outline, width=stroke)
+            else:
+                pen.rectangle(box, fill=fill, outline=outline, width=stroke)
+            if layer is not im:
+                im.alpha_composite(layer)
+        elif _draw_text(draw, shape, ppi):
+            overflow.append(shape)
+            draw.rectangle(box, outline=_OVERFLOW, width=2)
+    return im.convert("RGB"), overflow
+
+
+def contact_sheet(images, labels, columns=COLUMNS):
+    """All `images` in a grid, each numbered and labelled in its corner."""
+    from PIL import Image, ImageDraw
+    w, h = images[0].size
+    rows = (len(images) + columns - 1) // columns
+    cols = min(columns, len(images))
+    sheet = Image.new("RGB", (cols * (w + _GAP) + _GAP, rows * (h + _GAP) + _GAP), (40, 40, 48))
+    draw = ImageDraw.Draw(sheet)
+    for n, (im, label) in enumerate(zip(images, labels)):
+        x = _GAP + (n % columns) * (w + _GAP)
+        y = _GAP + (n // columns) * (h + _GAP)
+        sheet.paste(im, (x, y))
+        text = "%d  %s" % (n + 1, label)
+        right, bottom = draw.textbbox((x + 4, y + 3), text)[2:]
+        draw.rectangle((x, y, right + 4, bottom + 3), fill=(0, 0, 0))
+        draw.text((x + 4, y + 3), text, fill=(255, 255, 255))
+    return sheet
+
+
+def _filename(n, label):
+    return "%02d-%s.png" % (n, re.sub(r"[^\w-]+", "-", label).strip("-"))
+
+
+def build_preview(config=None, out_dir=DEFAULT_DIR, width=WIDTH, columns=COLUMNS, pages=False,
+                  index=None):
+    """Draw every slide of `config` into `out_dir/sheet.png`; `pages` also
+    writes each slide as NN-name.png.
+
+    Returns (sheet path, [(label, overflowing text box count)]).
+    """
+    from . import slides  # noqa: F401  (registers the builders)
+    from .image_index import ImageIndex
+    from .media import MediaCache
+
+    config = config or DeckConfig()
+    index = index or ImageIndex(config.img_dir)
+    page_w, _ = layout.ASPECTS[config.aspect]
+    media = MediaCache(index, os.path.join(config.cache_dir, "preview", "media"),
+                       dpi=math.ceil(width / page_w), quality=_QUALITY)
+    layout.begin(None, index, media, config.aspect, load_captions(config.lang),
+                 content.captions(content.load()))
+    sketches = []
+    for builder, _, spec, label in layout.expand(layout.select_slides(config.slides)):
+        sketch = layout.new_slide()
+        if spec is None:
+            builder(sketch)
+        else:
+            builder(sketch, spec)
+        sketches.append((label, sketch))
+    # 只有第一次（或照片改過）才需要產生預覽用的衍生圖
+    media.render_pending(config.jobs)
+    index.save()
+
+    os.makedirs(out_dir, exist_ok=True)
+    images, report = [], []
+    for n, (label, sketch) in enumerate(sketches, 1):
+        im, overflow = render(sketch, width)
+        if pages:
+            im.save(os.path.join(out_dir, _filename(n, label)), compress_level=1)
+        images.append(im)
+        report.append((label, len(overflow)))
+    path = os.path.join(out_dir, "sheet.png")
+    contact_sheet(images, [label for label, _ in sketches], columns).save(path, compress_level=1)
+    return path, report
@@ -0,0 +1,265 @@
+"""
+簡報下載服務
+由 nginx 反向代理，提供 GET /deck.pptx（可加 ?aspect=4:3&lang=en）。
+
+- 輸入（程式碼、對照表、img/ 的 mtime 與大小、建置選項）沒變就直接回傳磁碟上的成品，
+  成品以內容 SHA-256 命名（.cache/decks/<sha256>.pptx），ETag 也就是這個雜湊，
+  支援 If-None-Match → 304。
+- 輸入變了才重新建置；同一時間的多個請求共用同一次建置（single-flight），
+  建置在子 process 中執行，不會卡住其他請求。
+- 檢查輸入要 stat 每一張照片，結果保留 INPUTS_TTL 秒，期間的請求（包括 304）共用。
+- 完全離線，只用標準函式庫與 camino 本身。
+"""
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .config import BASE, CACHE, CAPTIONS_DIR, SOURCE_LANG, snapshot
+from .layout import ASPECTS
+
+DECKS_DIR = os.path.join(CACHE, "decks")
+DOWNLOAD_NAME = "朝聖之路.pptx"
+# 輸入的快照沿用幾秒；改了照片或程式碼後最多這麼久才會被發現
+INPUTS_TTL = 2.0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result."""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+def parse_variant(query):
+    """Build options for a /deck.pptx query string; ValueError on unknown values."""
+    params = urllib.parse.parse_qs(query)
+    aspect = params.get("aspect", ["16:9"])[-1]
+    lang = params.get("lang", [SOURCE_LANG])[-1]
+    if aspect not in ASPECTS:
+        raise ValueError("aspect must be one of " + ", ".join(ASPECTS))
+    langs = [SOURCE_LANG] + sorted(n[:-5] for n in os.listdir(CAPTIONS_DIR) if n.endswith(".json"))
+    if lang not in langs:
+        raise ValueError("lang must be one of " + ", ".join(langs))
+    return ("--aspect", aspect, "--lang", lang)
+
+
+class DeckService:
+    """Content-addressed deck artifacts, rebuilt only when their inputs change."""
+
+    def __init__(self, decks_dir=DECKS_DIR, build_args=()):
+        self.decks_dir = decks_dir
+        self.build_args = tuple(build_args)
+        self._flight = SingleFlight()
+        # 一次只跑一個建置：不同版本同時被要求時排隊，避免搶 CPU 與快取
+        self._build_lock = threading.Lock()
+        self._inputs_lock = threading.Lock()
+        self._inputs = (None, 0.0)        # (快照的雜湊, 取得的時間)
+        os.makedirs(decks_dir, exist_ok=True)
+
+    def _inputs_digest(self):
+        """Hash of snapshot(), recomputed at most every INPUTS_TTL seconds."""
+        with self._inputs_lock:
+            digest, taken = self._inputs
+            if digest is None or time.monotonic() - taken > INPUTS_TTL:
+                h = hashlib.sha1()
+                for path, (mtime, size) in sorted(snapshot().items()):
+                    h.update(("%s\0%d\0%d\n" % (os.path.relpath(path, BASE), mtime, size))
+                             .encode("utf-8"))
+                digest = h.hexdigest()
+                self._inputs = (digest, time.monotonic())
+            return digest
+
+    def inputs_key(self, variant):
+        h = hashlib.sha1(self._inputs_digest().encode("ascii"))
+        h.update("\0".join(self.build_args + variant).encode("utf-8"))
+        return h.hexdigest()
+
+    def _ref(self, key):
+        return os.path.join(self.decks_dir, key + ".ref")
+
+    def artifact(self, variant=()):
+        """Return (path, sha256) of the up-to-date deck, building it if needed."""
+        key = self.inputs_key(variant)
+        try:
+            with open(self._ref(key), encoding="ascii") as f:
+                digest = f.read().strip()
+            path = os.path.join(self.decks_dir, digest + ".pptx")
+            if os.path.exists(path):
+                return path, digest
+        except OSError:
+            pass
+        return self._flight.do(key, lambda: self._build(key, variant))
+
+    def _build(self, key, variant):
+        # 暫存檔名不含 key：build 會記住每個輸出路徑的內容雜湊（.cache/outputs/），不必每次一個新名字
+        tmp = os.path.join(self.decks_dir, "build.%d.tmp" % threading.get_ident())
+        cmd = [sys.executable, "-m", "camino", "build", "--stream", "-o", tmp]
+        cmd += list(self.build_args + variant)
+        with self._build_lock:
+            proc = subprocess.run(cmd, cwd=BASE, stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise RuntimeError("build failed:\n" + proc.stderr)
+
+        h = hashlib.sha256()
+        with open(tmp, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        path = os.path.join(self.decks_dir, digest + ".pptx")
+        os.replace(tmp, path)
+        with open(self._ref(key) + ".tmp", "w", encoding="ascii") as f:
+            f.write(digest)
+        os.replace(self._ref(key) + ".tmp", self._ref(key))
+        self._prune()
+        return path, digest
+
+    def _prune(self):
+        """Drop stale refs (inputs that changed since) and decks no ref points at."""
+        current = {self.inputs_key(v) for v in self._variants()}
+        live = set()
+        for name in os.listdir(self.decks_dir):
+            if not name.endswith(".ref"):
+                continue
+            path = os.path.join(self.decks_dir, name)
+            if name[:-4] not in current:
+                os.remove(path)
+                continue
+            with open(path, encoding="ascii") as f:
+                live.add(f.read().strip() + ".pptx")
+        for name in os.listdir(self.decks_dir):
+            if name.endswith(".pptx") and name not in live:
+                # 已開啟的下載在 POSIX 上仍可讀完
+                os.remove(os.path.join(self.decks_dir, name))
+
+    def _variants(self):
+        langs = [SOURCE_LANG] + [n[:-5] for n in os.listdir(CAPTIONS_DIR) if n.endswith(".json")]
+        return [("--aspect", a, "--lang", l) for a in ASPECTS for l in langs]
+
+
+class DeckHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "camino"
+
+    def do_HEAD(self):
+        self._serve(body=False)
+
+    def do_GET(self):
+        self._serve(body=True)
+
+    def _serve(self, body):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/deck.pptx":
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        try:
+            variant = parse_variant(url.query)
+        except ValueError as e:
+            self.send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        try:
+            path, digest = self.server.service.artifact(variant)
+        except Exception as e:
+            self.log_error("%s", e)
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "build failed")
+            return
+
+        etag = '"%s"' % digest
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            # 查到之後、送出之前被另一個建置清掉了：再查一次，必要時重新建置
+            try:
+                path, digest = self.server.service.artifact(variant)
+                f = open(path, "rb")
+            except Exception as e:
+                self.log_error("%s", e)
+                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "deck unavailable")
+                return
+            etag = '"%s"' % digest
+        except OSError as e:
+            self.log_error("%s", e)
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "deck unavailable")
+            return
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/vnd.openxmlformats-officedocument"
+                                             ".presentationml.presentation")
+            self.send_header("Content-Length", str(size))
+            self.send_header("ETag", etag)
+            # 每次都向伺服器確認，內容沒變只回 304
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Content-Disposition", "attachment; filename*=UTF-8''"
+                             + urllib.parse.quote(DOWNLOAD_NAME))
+            self.end_headers()
+            if not body:
+                return
+            try:
+                self.connection.sendfile(f)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    # If-None-Match 用弱比較：W/"x" 與 "x" 視為相同
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+
+def serve(host="127.0.0.1", port=8000, build_args=()):
+    server = ThreadingHTTPServer((host, port), DeckHandler)
+    server.service = DeckService(build_args=build_args)
+    print(f"Serving /deck.pptx on http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,104 @@
+"""
+網站建置：index.html + img/ → dist/
+
+index.html 與 img/ 仍是手寫的原始檔；`python -m camino site` 依序執行各個步驟
+（見 STAGES），把可直接部署的檔案寫到 dist/，Dockerfile 再把 dist/ 交給 nginx。
+圖片衍生檔以原圖內容 SHA-1 為鍵快取於 .cache/site/，沒改過的照片不會重新處理。
+"""
+import os
+import shutil
+
+from ..config import BASE, CACHE, IMG
+
+DIST = os.path.join(BASE, "dist")
+SITE_CACHE = os.path.join(CACHE, "site")
+SOURCE_HTML = os.path.join(BASE, "index.html")
+STATIC_FILES = ["favicon.svg"]
+# dist/ 裡有這個檔案才會被整個清掉重建，避免 -o 指到其他資料夾時誤刪
+MARKER = ".camino-site"
+
+
+class Site:
+    """The page being built plus every file that goes into dist/.
+
+    `files` maps a path inside dist/ to either a file on disk or bytes.
+    """
+
+    def __init__(self, html, index, cache_dir, jobs=None):
+        self.html = html
+        self.index = index
+        self.cache_dir = cache_dir
+        self.jobs = jobs
+        self.files = {}
+        self.pictures = {}       # img/ name → responsive.Picture
+        self.manifest = {}       # dist 內原本的路徑 → 含內容雜湊的路徑
+
+    def log(self, message):
+        print(message)
+
+
+def load_site(jobs=None, index=None):
+    """A Site for index.html and img/; `index` lets the deck build share its ImageIndex.
+
+    The gallery is already laid out from gallery.json, so image_jobs() sees its photos.
+    """
+    from ..image_index import ImageIndex
+    from . import gallery
+    with open(SOURCE_HTML, encoding="utf-8") as f:
+        html = f.read()
+    site = Site(html, index or ImageIndex(IMG), SITE_CACHE, jobs)
+    for name in STATIC_FILES:
+        site.files[name] = os.path.join(BASE, name)
+    gallery.run(site)
+    return site
+
+
+def image_jobs(site):
+    """Render jobs for every image derivative the site still needs.
+
+    Rendering them ahead of build_site() (e.g. together with the deck's, see
+    camino/pipeline.py) leaves nothing for its stages to decode.
+    """
+    from . import lqip, responsive
+    return lqip.jobs(site) + responsive.jobs(site)
+
+
+def build_site(out_dir=DIST, jobs=None, index=None):
+    """Build the deployable site into `out_dir` and return it."""
+    from . import captions, compress, critical, fingerprint, lqip, minify, offline, responsive
+
+    site = load_site(jobs, index)
+    # offline 要在最後：precache 清單用的是最終的檔名與 index.html
+    for stage in (captions.run, lqip.run, responsive.run, fingerprint.run,
+                  critical.run, minify.run, fingerprint.run, offline.run):
+        stage(site)
+
+    site.files["index.html"] = site.html.encode("utf-8")
+    # 所有檔案都定案之後才壓縮
+    compress.run(site)
+    write(site.files, out_dir)
+    site.index.save()
+    return out_dir
+
+
+def write(files, out_dir):
+    """Replace `out_dir` with exactly `files`."""
+    if os.path.isdir(out_dir) and os.listdir(out_dir) and \
+            not os.path.exists(os.path.join(out_dir, MARKER)):
+        raise FileExistsError(f"{out_dir} exists and was not created by `camino site`")
+    tmp = out_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    for path, data in files.items():
+        dst = os.path.join(tmp, path)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if isinstance(data, bytes):
+            with open(dst, "wb") as f:
+                f.write(data)
+        else:
+            try:
+                os.link(data, dst)       # 衍生檔來自快取，能用 hard link 就不複製
+            except OSError:
+                shutil.copyfile(data, dst)
+    open(os.path.join(tmp, MARKER), "w").close()
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp, out_dir)
@@ -0,0 +1,29 @@
+"""
+照片圖說
+note.md（見 camino/content.py）的說明寫進對應 <img> 的 data-caption，
+燈箱打開時顯示在照片下方；簡報則把同一段說明當作圖片的替代文字。
+"""
+import os
+
+from .. import content
+from .markup import find_images, splice, start_tag
+
+
+def rewrite(html, captions):
+    """Add data-caption to every <img src="img/…"> that has a caption and none yet."""
+    edits = []
+    for img in find_images(html):
+        attrs = dict(img.attrs)
+        src = attrs.get("src") or ""
+        caption = captions.get(src[4:]) if src.startswith("img/") else None
+        if caption and "data-caption" not in attrs:
+            edits.append((img.offset, len(img.text),
+                          start_tag("img", list(img.attrs) + [("data-caption", caption)])))
+    return splice(html, edits), len(edits)
+
+
+def run(site):
+    if not os.path.exists(content.NOTE):
+        site.log("Warning: " + content.MISSING)
+    site.html, count = rewrite(site.html, content.captions(content.load()))
+    site.log(f"Captions from note.md: {count} photos.")
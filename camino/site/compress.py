@@ -0,0 +1,82 @@
+"""
+預先壓縮
+dist/ 裡的文字檔（HTML、SVG、JSON…）各寫出最高壓縮等級的 .gz 與 .br，nginx 以
+gzip_static 直接送出，每個請求都不必再花 CPU 壓縮。
+
+- 壓縮結果以原檔 SHA-256 為鍵快取於 .cache/site/compressed/，內容沒變就不重新壓縮。
+- 每個壓縮檔都先解壓比對一次，確定與原檔完全相同才使用。
+- 沒有安裝 brotli 套件時只產生 .gz。
+"""
+import gzip
+import hashlib
+import os
+
+TEXT_EXTS = (".html", ".css", ".js", ".json", ".map", ".svg", ".txt", ".xml", ".webmanifest")
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def encoders():
+    """[(suffix, compress, decompress)] for every available encoding."""
+    found = [(".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0), gzip.decompress)]
+    brotli = _brotli()
+    if brotli is not None:
+        found.append((".br", lambda d: brotli.compress(d, quality=11), brotli.decompress))
+    return found
+
+
+def _read(data):
+    if isinstance(data, bytes):
+        return data
+    with open(data, "rb") as f:
+        return f.read()
+
+
+def compressed(data, cache_dir, suffix, compress, decompress):
+    """Path of the cached `suffix` encoding of `data`, or None when it does not
+    make the file smaller."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = os.path.join(cache_dir, digest + suffix)
+    skip = path + ".skip"            # 壓縮後沒有比較小，記下來不再重試
+    if os.path.exists(path):
+        return path
+    if os.path.exists(skip):
+        return None
+    os.makedirs(cache_dir, exist_ok=True)
+    packed = compress(data)
+    if decompress(packed) != data:
+        raise RuntimeError(f"{suffix} round-trip mismatch for {digest}")
+    if len(packed) >= len(data):
+        open(skip, "w").close()
+        return None
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp, "wb") as f:
+        f.write(packed)
+    os.replace(tmp, path)
+    return path
+
+
+def run(site):
+    cache_dir = os.path.join(site.cache_dir, "compressed")
+    found = encoders()
+    before = after = 0
+    for path, data in sorted(site.files.items()):
+        if not path.endswith(TEXT_EXTS):
+            continue
+        data = _read(data)
+        for suffix, compress, decompress in found:
+            packed = compressed(data, cache_dir, suffix, compress, decompress)
+            if packed is None:
+                continue
+            site.files[path + suffix] = packed
+            if suffix == ".gz":
+                before += len(data)
+                after += os.path.getsize(packed)
+    names = "/".join(s for s, _, _ in found)
+    site.log(f"Precompressed text assets ({names}): {before // 1024} KB → {after // 1024} KB gzip.")
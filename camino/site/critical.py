@@ -0,0 +1,71 @@
+"""
+關鍵 CSS
+index.html 只內嵌第一個畫面（導覽列與首頁大圖）用得到的規則，完整的樣式表另存成
+site.css，以 media="print" + onload 非同步載入，不再擋住第一次繪製。
+
+判斷方式很保守：選擇器裡出現的標籤、class、id 全都出現在第一屏的元素上就算關鍵
+（不看結構與虛擬類別）。site.css 仍是完整的原始樣式表，載入後的層疊順序與原本相同。
+模糊預覽圖（lqip.py）的規則不論位置一律內嵌：<head> 的 script 一加上 .js，還沒載入的
+圖片就要先隱藏，不能等 site.css。
+"""
+import re
+import textwrap
+
+from .css import Vocabulary, parse, selector_matches, split_top
+
+# 第一屏到這個 class 的元素結束為止
+FOLD_CLASS = "hero"
+STYLESHEET = "site.css"
+# 含這些 class 的規則不在第一屏也內嵌（見 lqip.CSS）
+ALWAYS_CLASSES = ("lqip", "lqip-img")
+
+_STYLE = re.compile(r"[ \t]*<style>(.*?)</style>\n?", re.S)
+
+
+def _always(selector):
+    return any(c in ALWAYS_CLASSES for c in re.findall(r"\.([\w-]+)", selector))
+
+
+def _critical_rules(rules, fold):
+    out = []
+    for prelude, body, _, _ in rules:
+        if body is None or prelude.startswith(("@keyframes", "@font-face", "@page")):
+            continue
+        if prelude.startswith(("@media", "@supports")):
+            inner = _critical_rules(parse(body), fold)
+            if inner:
+                out.append("%s { %s }" % (prelude, " ".join(inner)))
+        elif any(selector_matches(s, fold) or _always(s) for s in split_top(prelude, ",")):
+            out.append("%s { %s }" % (prelude, " ".join(body.split())))
+    return out
+
+
+def critical_css(css, html):
+    """The rules of `css` that apply above the fold of `html` or style the
+    placeholders (ALWAYS_CLASSES), plus the @keyframes they animate with."""
+    fold = Vocabulary(html, FOLD_CLASS)
+    rules = parse(css)
+    out = _critical_rules(rules, fold)
+    text = "\n".join(out)
+    for prelude, body, _, _ in rules:
+        name = prelude.split()[-1] if prelude.startswith("@keyframes") else None
+        if name and re.search(r"\b%s\b" % re.escape(name), text):
+            out.append("%s { %s }" % (prelude, " ".join(body.split())))
+    return "\n".join(out)
+
+
+def run(site):
+    match = _STYLE.search(site.html)
+    if match is None:
+        return
+    css = match.group(1)
+    critical = critical_css(css, site.html)
+    lines = "\n".join("    " + line for line in critical.splitlines())
+    head = ("  <style>\n%s\n  </style>\n"
+            '  <link rel="stylesheet" href="%s" media="print" onload="this.media=\'all\'">\n'
+            '  <noscript><link rel="stylesheet" href="%s"></noscript>\n') % (lines, STYLESHEET, STYLESHEET)
+    site.html = site.html[:match.start()] + head + site.html[match.end():]
+    site.files[STYLESHEET] = (textwrap.dedent(css).strip() + "\n").encode("utf-8")
+    site.log(f"Critical CSS: {len(critical.encode()) // 1024} KB inline, "
+             f"{len(css.encode()) // 1024} KB deferred to {STYLESHEET}.")
+
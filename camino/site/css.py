@@ -0,0 +1,326 @@
+"""
+CSS 小工具
+切出規則、拿選擇器和頁面上實際出現的標籤 / class / id 比對、壓縮成一行並產生 source map。
+只處理這個網站用得到的 CSS 語法，不是完整的 CSS parser。
+"""
+import re
+from collections import namedtuple
+from html.parser import HTMLParser
+
+from .markup import VOID_TAGS
+
+# prelude：選擇器或 @ 規則；body 為 None 表示 `@import …;` 這類敘述
+# offset / body_offset：在原始字串中的位置（供 source map 使用）
+Rule = namedtuple("Rule", "prelude body offset body_offset")
+
+# 內容是其他規則（而非宣告）的 @ 規則
+NESTED_AT_RULES = ("@media", "@supports", "@container", "@layer", "@keyframes")
+
+_PSEUDO = re.compile(r"::?[\w-]+(\([^)]*\))?")
+_STRING_OR_SPACE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|\s+""")
+
+
+# ══════════════════════════════════════════════════════════════
+# Parsing
+# ══════════════════════════════════════════════════════════════
+
+def _skip(css, i):
+    """Index just past the string or comment starting at `i`, else None."""
+    if css.startswith("/*", i):
+        end = css.find("*/", i + 2)
+        return len(css) if end < 0 else end + 2
+    if css[i] in "'\"":
+        j = i + 1
+        while j < len(css) and css[j] != css[i]:
+            j += 2 if css[j] == "\\" else 1
+        return j + 1
+    return None
+
+
+def _block_end(css, i):
+    """Index just past the } matching the { at `i`."""
+    depth, j = 0, i
+    while j < len(css):
+        skip = _skip(css, j)
+        if skip is not None:
+            j = skip
+            continue
+        if css[j] == "{":
+            depth += 1
+        elif css[j] == "}":
+            depth -= 1
+            if depth == 0:
+                return j + 1
+        j += 1
+    return len(css)
+
+
+def parse(css, base=0):
+    """Split `css` into top-level [Rule]; comments are dropped."""
+    rules = []
+    buf, start = [], None
+    i = 0
+    while i < len(css):
+        skip = _skip(css, i)
+        if skip is not None:
+            if css[i] != "/":
+                start = i if start is None else start
+                buf.append(css[i:skip])
+            i = skip
+            continue
+        c = css[i]
+        if c == ";" or c == "{":
+            prelude = "".join(buf).strip()
+            if c == "{":
+                end = _block_end(css, i)
+                offset = base + (i if start is None else start)
+                rules.append(Rule(prelude, css[i + 1:end - 1], offset, base + i + 1))
+                i = end
+            else:
+                if prelude:
+                    rules.append(Rule(prelude, None, base + start, None))
+                i += 1
+            buf, start = [], None
+            continue
+        if c != "}":
+            if start is None and not c.isspace():
+                start = i
+            buf.append(c)
+        i += 1
+    return rules
+
+
+def split_top(text, sep):
+    """Split `text` on `sep` outside strings, comments and parentheses."""
+    parts, depth, last, i = [], 0, 0, 0
+    while i < len(text):
+        skip = _skip(text, i)
+        if skip is not None:
+            i = skip
+            continue
+        c = text[i]
+        if c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif c == sep and depth == 0:
+            parts.append(text[last:i])
+            last = i + 1
+        i += 1
+    parts.append(text[last:])
+    return parts
+
+
+# ══════════════════════════════════════════════════════════════
+# Matching against the page
+# ══════════════════════════════════════════════════════════════
+
+class Vocabulary(HTMLParser):
+    """Tags, classes and ids used by a page, optionally only up to the end of
+    the first element with class `fold_class`.
+
+    For the whole page, string literals in inline scripts also count as class
+    and id names, since classList.add('visible') and friends add them later.
+    """
+
+    def __init__(self, html, fold_class=None):
+        super().__init__(convert_charrefs=True)
+        self.tags = {"html", "body"}
+        self.classes = set()
+        self.ids = set()
+        self.fold_class = fold_class
+        self._depth = 0
+        self._fold_depth = None
+        self._done = False
+        self._script = False
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        self.tags.add(tag)
+        self.classes.update(classes)
+        if attrs.get("id"):
+            self.ids.add(attrs["id"])
+        self._script = tag == "script"
+        if tag in VOID_TAGS:
+            return
+        self._depth += 1
+        if self._fold_depth is None and self.fold_class in classes:
+            self._fold_depth = self._depth
+
+    def handle_endtag(self, tag):
+        self._script = False
+        if self._done:
+            return
+        if self._fold_depth is not None and self._depth == self._fold_depth:
+            self._done = True
+        self._depth -= 1
+
+    def handle_data(self, data):
+        if self._script and self.fold_class is None:
+            names = re.findall(r"""['"`]([A-Za-z][\w-]*)['"`]""", data)
+            self.classes.update(names)
+            self.ids.update(names)
+
+
+def selector_matches(selector, vocab):
+    """True unless some tag, class or id in `selector` never occurs in `vocab`.
+
+    Structure, attributes and pseudo-classes are ignored, so this can only
+    err on the side of keeping a selector.
+    """
+    for compound in re.split(r"[\s>+~]+", _PSEUDO.sub("", selector).strip()):
+        compound = re.sub(r"\[[^\]]*\]", "", compound)
+        if compound in ("", "*"):
+            continue
+        tag = re.match(r"[a-zA-Z][\w-]*", compound)
+        if tag and tag.group(0).lower() not in vocab.tags:
+            return False
+        if any(c not in vocab.classes for c in re.findall(r"\.([\w-]+)", compound)):
+            return False
+        if any(i not in vocab.ids for i in re.findall(r"#([\w-]+)", compound)):
+            return False
+    return True
+
+
+def animation_names(css, keep=None):
+    """Names referenced by animation / animation-name in rules that `keep` keeps."""
+    names = set()
+    for rule in parse(css):
+        if rule.body is None or rule.prelude.startswith("@keyframes"):
+            continue
+        if rule.prelude.startswith(NESTED_AT_RULES):
+            names |= animation_names(rule.body, keep)
+            continue
+        if keep is not None and not any(keep(s) for s in split_top(rule.prelude, ",")):
+            continue
+        for decl in split_top(rule.body, ";"):
+            name, _, value = decl.partition(":")
+            if name.strip() in ("animation", "animation-name"):
+                names.update(re.findall(r"[A-Za-z_][\w-]*", value))
+    return names
+
+
+# ══════════════════════════════════════════════════════════════
+# Minifying
+# ══════════════════════════════════════════════════════════════
+
+def _collapse(text):
+    """Collapse whitespace outside strings to single spaces."""
+    return _STRING_OR_SPACE.sub(lambda m: m.group(1) or " ", text).strip()
+
+
+def _outside_strings(text, fn):
+    parts = re.split(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""", text)
+    return "".join(p if i % 2 else fn(p) for i, p in enumerate(parts))
+
+
+def _tighten_value(text):
+    """Drop spaces around commas and just inside parentheses."""
+    def tighten(p):
+        p = re.sub(r"\(\s+|\s+\)", lambda m: m.group(0).strip(), p)
+        return re.sub(r"\s*,\s*", ",", p)
+    return _outside_strings(text, tighten)
+
+
+def _tighten_selector(text):
+    """Drop spaces around the >, + and ~ combinators."""
+    return _outside_strings(text, lambda p: re.sub(r"\s*([>+~])\s*", r"\1", p))
+
+
+def _declarations(body):
+    out = []
+    for decl in split_top(body, ";"):
+        name, colon, value = decl.partition(":")
+        if not colon:
+            continue
+        value = _tighten_value(_collapse(value))
+        out.append("%s:%s" % (name.strip(), value.replace(" !important", "!important")))
+    return ";".join(out)
+
+
+def minify(css, keep=None, animations=None, base=0):
+    """Minify `css` to one line.
+
+    `keep(selector)` drops unused selectors (and rules left with none);
+    `animations`, when given, drops @keyframes not named in it. Returns
+    (text, marks) where marks are (output offset, source offset) pairs, one
+    per rule, for source maps.
+    """
+    out, marks, pos = [], [], 0
+    for rule in parse(css, base):
+        prelude = _collapse(rule.prelude)
+        if rule.body is None:
+            text, inner_marks = prelude + ";", []
+        elif prelude.startswith("@keyframes"):
+            if animations is not None and prelude.split()[-1] not in animations:
+                continue
+            inner, inner_marks = minify(rule.body, base=rule.body_offset)
+            text = prelude + "{" + inner + "}"
+        elif prelude.startswith(NESTED_AT_RULES):
+            inner, inner_marks = minify(rule.body, keep, animations, rule.body_offset)
+            if not inner:
+                continue
+            text = prelude + "{" + inner + "}"
+        elif prelude.startswith("@"):
+            text, inner_marks = prelude + "{" + _declarations(rule.body) + "}", []
+        else:
+            selectors = [_collapse(s) for s in split_top(rule.prelude, ",")]
+            if keep is not None:
+                selectors = [s for s in selectors if keep(s)]
+            declarations = _declarations(rule.body)
+            if not selectors or not declarations:
+                continue
+            text = ",".join(_tighten_selector(s) for s in selectors) + "{" + declarations + "}"
+            inner_marks = []
+        head = len(prelude) + 1
+        marks.append((pos, rule.offset))
+        marks.extend((pos + head + g, o) for g, o in inner_marks)
+        out.append(text)
+        pos += len(text)
+    return "".join(out), marks
+
+
+# ══════════════════════════════════════════════════════════════
+# Source maps
+# ══════════════════════════════════════════════════════════════
+
+_B64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def _vlq(value):
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    out = ""
+    while True:
+        digit, value = value & 31, value >> 5
+        out += _B64[digit | (32 if value else 0)]
+        if not value:
+            return out
+
+
+def source_map(marks, source, source_name, file_name):
+    """Source map v3 for one-line output; `marks` as returned by minify()."""
+    line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+    segments, prev = [], (0, 0, 0)
+    for gen_col, offset in sorted(marks):
+        line = _line_of(line_starts, offset)
+        col = offset - line_starts[line]
+        segments.append(_vlq(gen_col - prev[0]) + "A" + _vlq(line - prev[1]) + _vlq(col - prev[2]))
+        prev = (gen_col, line, col)
+    return {"version": 3, "file": file_name, "sources": [source_name],
+            "sourcesContent": [source], "names": [], "mappings": ",".join(segments)}
+
+
+def _line_of(line_starts, offset):
+    lo, hi = 0, len(line_starts) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if line_starts[mid] <= offset:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
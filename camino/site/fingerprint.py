@@ -0,0 +1,64 @@
+"""
+內容雜湊檔名
+dist/ 裡除了 index.html 以外的檔案都改名成 <名稱>.<雜湊>.<副檔名>，並改寫 index.html
+中的引用，另外寫出 asset-manifest.json（原檔名 → 新檔名）。
+
+檔名隨內容改變，nginx 就能讓這些檔案快取一年（immutable），只有 index.html 每次
+向伺服器確認；換掉一張照片，回訪者只會重新下載那張照片與 HTML。
+"""
+import hashlib
+import json
+import os
+import re
+
+HASH_LEN = 10
+MANIFEST = "asset-manifest.json"
+# 會引用其他檔案、需要先改寫內容的檔案
+REWRITE_EXTS = (".css",)
+# index.html 中可能是路徑的片段（屬性值、srcset、CSS url()）
+_TOKEN = re.compile(r"[\w][\w./-]*")
+
+
+def content_hash(data):
+    h = hashlib.sha256()
+    if isinstance(data, bytes):
+        h.update(data)
+    else:
+        with open(data, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()[:HASH_LEN]
+
+
+def hashed_name(path, digest):
+    stem, ext = os.path.splitext(path)
+    return "%s.%s%s" % (stem, digest, ext)
+
+
+def _rewrite(text, manifest):
+    return _TOKEN.sub(lambda m: manifest.get(m.group(0), m.group(0)), text)
+
+
+def run(site):
+    """Hash every file not hashed by an earlier run.
+
+    Runs twice: once before the CSS stages, so site.css is minified (and
+    source-mapped) with its final image URLs, and once at the end for the
+    files those stages added.
+    """
+    manifest = site.manifest
+    done = set(manifest.values()) | {MANIFEST}
+    pending = [p for p in site.files if p not in done]
+    # 樣式表裡也有 url(img/…)：先處理其他檔案，改寫引用後再算樣式表自己的雜湊
+    for path in sorted(pending, key=lambda p: (p.endswith(REWRITE_EXTS), p)):
+        data = site.files.pop(path)
+        if path.endswith(REWRITE_EXTS):
+            if not isinstance(data, bytes):
+                with open(data, "rb") as f:
+                    data = f.read()
+            data = _rewrite(data.decode("utf-8"), manifest).encode("utf-8")
+        manifest[path] = hashed_name(path, content_hash(data))
+        site.files[manifest[path]] = data
+    site.html = _rewrite(site.html, manifest)
+    site.files[MANIFEST] = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    site.log(f"Fingerprinted {len(pending)} assets.")
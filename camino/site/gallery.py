@@ -0,0 +1,35 @@
+"""
+相簿
+.gallery-grid 裡的 .gallery-item 依 gallery.json（見 camino/curate.py）重新排出：
+第一個 .gallery-item 是樣板，每張照片複製一份、換掉 <img> 的 src。
+這一步在 load_site() 就完成，之後的衍生圖、LQIP 與圖說都只看到相簿實際放的照片。
+"""
+from .. import content
+from .markup import find_elements, find_images, start_tag
+
+
+def rewrite(html, names):
+    """Replace the items of the first .gallery-grid with one per photo in `names`."""
+    grids = find_elements(html, "gallery-grid")
+    if not grids or not names:
+        return html
+    grid = grids[0]
+    items = [e for e in find_elements(html, "gallery-item") if grid.start < e.start < grid.end]
+    if not items:
+        return html
+    template = html[items[0].start:items[0].end]
+    img = find_images(template)[0]
+    # 項目之間沿用原本的換行與縮排
+    indent = html[html.rfind("\n", 0, items[0].start):items[0].start]
+    parts = []
+    for name in names:
+        attrs = [(k, "img/" + name if k == "src" else v) for k, v in img.attrs]
+        parts.append(template[:img.offset] + start_tag("img", attrs)
+                     + template[img.offset + len(img.text):])
+    return html[:items[0].start] + indent.join(parts) + html[items[-1].end:]
+
+
+def run(site):
+    names = content.load_gallery()
+    site.html = rewrite(site.html, names)
+    site.log(f"Gallery from gallery.json: {len(names)} photos.")
@@ -0,0 +1,201 @@
+"""
+模糊預覽圖（LQIP）
+每張照片縮成約 20px 的 WebP，以 data URI 直接寫進 index.html，當成圖片位置的初始背景；
+真正的圖片載入後再淡入。慢速網路下版面一開始就有顏色與輪廓，不必多發任何請求。
+
+預覽圖以原圖內容 SHA-1 為鍵快取於 .cache/site/lqip.json。縮圖本身是一般的衍生圖工作
+（無損 PNG，存於 .cache/site/lqip/），與其他尺寸一起處理，原圖只解碼一次。
+"""
+import base64
+import io
+import json
+import os
+
+from .markup import attr, find_images, splice, start_tag
+
+# 預覽圖最長邊（px）與 WebP 品質；每張約 200 bytes
+PLACEHOLDER_PX = 20
+QUALITY = 30
+# 這些區塊用 CSS filter 把照片調暗，預覽圖疊上同樣深度的黑色（見 index.html 的 CSS）
+OVERLAYS = {"full-break": "rgba(0, 0, 0, 0.55)"}
+
+CSS = """\
+    .lqip { display: block; }
+    .js img.lqip-img { opacity: 0; }
+    .js img.lqip-img.loaded { opacity: 1; animation: lqip-in 0.6s ease; }
+    @keyframes lqip-in { from { opacity: 0; } }
+    @media (prefers-reduced-motion: reduce) {
+      .js img.lqip-img.loaded { animation: none; }
+    }
+"""
+# 放在 <head>：圖片開始載入前就掛好 capture 階段的 load 監聽，不會漏掉已在快取中的圖片
+SCRIPT = """\
+  <script>
+    document.documentElement.classList.add('js');
+    document.addEventListener('load', (e) => {
+      if (e.target.tagName === 'IMG') e.target.classList.add('loaded');
+    }, true);
+  </script>
+"""
+
+
+def thumbnail(src, dst, size, quality):
+    """Render job: `src` shrunk to fit `size`, written to `dst` as a lossless PNG."""
+    from PIL import Image
+    from ..media import _open_rgb
+    # 解碼結果可能與其他衍生圖共用，縮圖前先複製
+    im = _open_rgb(src, (size[0] * 2, size[1] * 2)).copy()
+    im.thumbnail(size, Image.LANCZOS)
+    tmp = "%s.%d.tmp" % (dst, os.getpid())
+    im.save(tmp, "PNG")
+    os.replace(tmp, dst)
+
+
+def compute(paths):
+    """[(css colour, data URI)] for the thumbnails at `paths`, computed as one batch."""
+    import numpy as np
+    from PIL import Image, features
+
+    thumbs = []
+    for path in paths:
+        with Image.open(path) as im:
+            thumbs.append(im.convert("RGB"))
+    if not thumbs:
+        return []
+    # 平均色一次算完：所有像素接成一個陣列，再依每張的起點分段加總
+    arrays = [np.asarray(t, dtype=np.float64).reshape(-1, 3) for t in thumbs]
+    counts = np.array([len(a) for a in arrays])
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    means = np.add.reduceat(np.concatenate(arrays), starts, axis=0) / counts[:, None]
+
+    fmt, mime = ("WEBP", "image/webp") if features.check("webp") else ("JPEG", "image/jpeg")
+    results = []
+    for thumb, mean in zip(thumbs, np.rint(means).astype(int)):
+        buf = io.BytesIO()
+        thumb.save(buf, fmt, quality=QUALITY)
+        uri = "data:%s;base64,%s" % (mime, base64.b64encode(buf.getvalue()).decode("ascii"))
+        results.append(("#%02x%02x%02x" % tuple(mean), uri))
+    return results
+
+
+def _load(site):
+    try:
+        with open(os.path.join(site.cache_dir, "lqip.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _key(site, name):
+    return "%s-%d-q%d" % (site.index.digest(name), PLACEHOLDER_PX, QUALITY)
+
+
+def _thumbnail_path(site, name):
+    return os.path.join(site.cache_dir, "lqip", "%s-%d.png" % (site.index.digest(name)[:20], PLACEHOLDER_PX))
+
+
+def page_photos(site):
+    """img/ names of the photos on the page that exist."""
+    names = {_photo(img) for img in find_images(site.html)} - {None}
+    return sorted(n for n in names if os.path.exists(os.path.join(site.index.root, n)))
+
+
+def jobs(site, names=None):
+    """Render jobs for the thumbnails still needed by placeholders(site, names)."""
+    cache = _load(site)
+    queued = []
+    for name in page_photos(site) if names is None else names:
+        dst = _thumbnail_path(site, name)
+        if _key(site, name) not in cache and not os.path.exists(dst):
+            size = (PLACEHOLDER_PX, PLACEHOLDER_PX)
+            queued.append((thumbnail, os.path.join(site.index.root, name), dst, size, QUALITY))
+    return queued
+
+
+def placeholders(site, names):
+    """({name: (colour, data URI)}, number computed), reusing .cache/site/lqip.json."""
+    from ..media import render_jobs
+    path = os.path.join(site.cache_dir, "lqip.json")
+    cache = _load(site)
+    keys = {n: _key(site, n) for n in names}
+    missing = sorted(n for n in names if keys[n] not in cache)
+    if missing:
+        render_jobs(jobs(site, missing), site.jobs)
+        computed = compute([_thumbnail_path(site, n) for n in missing])
+        cache.update((keys[n], list(r)) for n, r in zip(missing, computed))
+        os.makedirs(site.cache_dir, exist_ok=True)
+        tmp = "%s.%d.tmp" % (path, os.getpid())
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=0)
+        os.replace(tmp, path)
+    return {n: tuple(cache[keys[n]]) for n in names}, len(missing)
+
+
+def background(colour, uri, classes):
+    layers = ""
+    for cls in classes:
+        if cls in OVERLAYS:
+            layers = "linear-gradient(%s, %s), " % (OVERLAYS[cls], OVERLAYS[cls])
+            break
+    return "background: %surl(%s) center / cover no-repeat %s" % (layers, uri, colour)
+
+
+def _with_style(attrs, style):
+    attrs = [(n, v) for n, v in attrs]
+    for i, (name, value) in enumerate(attrs):
+        if name == "style":
+            attrs[i] = (name, (value or "").strip().rstrip(";") + "; " + style)
+            return attrs
+    return attrs + [("style", style)]
+
+
+def _with_class(attrs, cls):
+    attrs = [(n, v) for n, v in attrs]
+    for i, (name, value) in enumerate(attrs):
+        if name == "class":
+            attrs[i] = (name, ((value or "") + " " + cls).strip())
+            return attrs
+    return attrs + [("class", cls)]
+
+
+def _photo(img):
+    """The img/ file name an <img> shows, or None."""
+    src = dict(img.attrs).get("src") or ""
+    return src[4:] if src.startswith("img/") else None
+
+
+def rewrite(html, found):
+    """Give every <img src="img/…"> listed in `found` a placeholder background.
+
+    An image alone in its parent paints the placeholder on that parent; images
+    sharing a parent (grids) are each wrapped in a <span class="lqip">.
+    """
+    images = [img for img in find_images(html) if _photo(img) in found]
+    per_parent = {}
+    for img in images:
+        if img.ancestors:
+            per_parent[img.ancestors[0].offset] = per_parent.get(img.ancestors[0].offset, 0) + 1
+
+    edits = []
+    for img in images:
+        colour, uri = found[_photo(img)]
+        tag = start_tag("img", _with_class(img.attrs, "lqip-img"))
+        parent = img.ancestors[0] if img.ancestors else None
+        if parent is not None and per_parent[parent.offset] == 1:
+            style = background(colour, uri, parent.classes)
+            edits.append((parent.offset, len(parent.text),
+                          start_tag(parent.tag, _with_style(parent.attrs, style))))
+            edits.append((img.offset, len(img.text), tag))
+        else:
+            classes = [c for e in img.ancestors for c in e.classes]
+            span = '<span class="lqip"%s>' % attr("style", background(colour, uri, classes))
+            edits.append((img.offset, len(img.text), span + tag + "</span>"))
+    html = splice(html, edits)
+    html = html.replace("</style>", CSS + "  </style>", 1)
+    return html.replace("</head>", SCRIPT + "</head>", 1)
+
+
+def run(site):
+    found, computed = placeholders(site, page_photos(site))
+    site.html = rewrite(site.html, found)
+    site.log(f"Placeholders: {len(found)} photos ({computed} computed).")
@@ -0,0 +1,119 @@
+"""
+HTML 小工具
+各個網站建置步驟共用：找出 <img> 與它的祖先元素、找出某個 class 的元素範圍、
+組屬性字串、依位置替換字串。
+只用標準函式庫的 HTMLParser，不依賴 lxml / BeautifulSoup。
+"""
+from collections import namedtuple
+from html.parser import HTMLParser
+
+# 一個開始標籤：在 html 中的位置、原文、屬性（(name, value) 列表）與 class
+Element = namedtuple("Element", "tag offset text attrs classes")
+# 一個 <img>：ancestors 由內而外
+Img = namedtuple("Img", "offset text attrs ancestors")
+# 一個完整的元素：html[start:end] 從開始標籤到結束標籤
+Span = namedtuple("Span", "tag start end attrs classes")
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+             "meta", "source", "track", "wbr"}
+
+
+class _ImgFinder(HTMLParser):
+    """Collect every <img> start tag with its position and open ancestors."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []          # [((line, col), tag, text, attrs)] of open elements
+        self.images = []         # [((line, col), text, attrs, stack copy)]
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "img":
+            self.images.append((self.getpos(), self.get_starttag_text(), attrs, list(self.stack)))
+        elif tag not in VOID_TAGS:
+            self.stack.append((self.getpos(), tag, self.get_starttag_text(), attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "img":
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][1] == tag:
+                del self.stack[i:]
+                break
+
+
+class _SpanFinder(HTMLParser):
+    """Collect the start and end position of every element with a given class."""
+
+    def __init__(self, cls):
+        super().__init__(convert_charrefs=True)
+        self.cls = cls
+        self.stack = []          # [((line, col), tag, attrs)] of open elements
+        self.spans = []          # [((line, col), (line, col) of the end tag, tag, attrs)]
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            self.stack.append((self.getpos(), tag, attrs))
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][1] == tag:
+                for pos, t, attrs in self.stack[i:]:
+                    if self.cls in (dict(attrs).get("class") or "").split():
+                        self.spans.append((pos, self.getpos(), t, attrs))
+                del self.stack[i:]
+                break
+
+
+def _offsets(html):
+    """Function turning HTMLParser's (line, col) positions into offsets in `html`."""
+    line_starts = [0]
+    for line in html.splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+    return lambda pos: line_starts[pos[0] - 1] + pos[1]
+
+
+def find_elements(html, cls):
+    """[Span] of every closed element with class `cls`, in document order."""
+    finder = _SpanFinder(cls)
+    finder.feed(html)
+    finder.close()
+    offset = _offsets(html)
+    spans = [Span(tag, offset(start), html.index(">", offset(end)) + 1, attrs,
+                  (dict(attrs).get("class") or "").split())
+             for start, end, tag, attrs in finder.spans]
+    return sorted(spans, key=lambda s: s.start)
+
+
+def find_images(html):
+    """[Img] for every <img> in `html`, in document order."""
+    finder = _ImgFinder()
+    finder.feed(html)
+    finder.close()
+    offset = _offsets(html)
+
+    images = []
+    for pos, text, attrs, stack in finder.images:
+        ancestors = [Element(tag, offset(p), t, a, (dict(a).get("class") or "").split())
+                     for p, tag, t, a in reversed(stack)]
+        images.append(Img(offset(pos), text, attrs, ancestors))
+    return images
+
+
+def attr(name, value):
+    """` name="value"` with the value escaped; a bare ` name` for None."""
+    if value is None:
+        return " " + name
+    return ' %s="%s"' % (name, value.replace("&", "&amp;").replace('"', "&quot;"))
+
+
+def start_tag(tag, attrs):
+    return "<" + tag + "".join(attr(n, v) for n, v in attrs) + ">"
+
+
+def splice(html, edits):
+    """Apply [(offset, length, replacement)] edits, which must not overlap."""
+    for offset, length, text in sorted(edits, key=lambda e: e[0], reverse=True):
+        html = html[:offset] + text + html[offset + length:]
+    return html
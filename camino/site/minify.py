@@ -0,0 +1,154 @@
+"""
+壓縮 HTML / CSS / JS
+- CSS：內嵌的關鍵 CSS 與 site.css 都壓成一行；頁面上（含 script 會加上的 class）
+  根本不存在的選擇器與沒用到的 @keyframes 直接刪掉。site.css 附 source map。
+- JS：只做不需要語法分析也安全的部分：去掉註解、縮排與空行，不合併行；
+  字串與 template literal 裡的內容不動。
+- HTML：去掉註解，連續空白縮成一個（<pre>、<textarea> 不動）。
+
+壓縮前的 index.html 與 site.css 留在 .cache/site/readable/，方便對照。
+"""
+import json
+import os
+import re
+
+from . import css as csslib
+from .critical import STYLESHEET
+
+_RAW = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)|<!--(.*?)-->",
+                  re.S | re.I)
+
+
+def minify_js(js):
+    """Strip indentation, blank lines and comments; lines are kept.
+
+    Quotes and template literals are tracked so comment markers inside a string
+    stay, and a backslash escapes the next character (in regex literals too).
+    """
+    out = []
+    quote = None            # 目前所在的字串：' " 或 `（template literal 可以跨行）
+    in_comment = False
+    for line in js.splitlines():
+        in_template = quote == "`"
+        code = []
+        i = 0
+        while i < len(line):
+            c = line[i]
+            if in_comment:
+                end = line.find("*/", i)
+                if end < 0:
+                    break
+                in_comment = False
+                i = end + 2
+                code.append(" ")        # 註解夾在兩個 token 之間時不能把它們黏在一起
+                continue
+            if c == "\\":
+                code.append(line[i:i + 2])
+                i += 2
+                continue
+            if quote:
+                if c == quote:
+                    quote = None
+            elif c in "'\"`":
+                quote = c
+            elif line.startswith("/*", i):
+                in_comment = True
+                i += 2
+                continue
+            elif line.startswith("//", i):
+                break
+            code.append(c)
+            i += 1
+        if quote != "`":
+            quote = None
+        text = "".join(code)
+        if in_template:
+            # 跨行的 template literal 裡的空白是字串內容，原樣保留
+            out.append(text)
+            continue
+        stripped = text.strip()
+        if stripped:
+            out.append(stripped)
+    return "\n".join(out)
+
+
+def _collapse_text(text):
+    return re.sub(r"\s+", lambda m: "\n" if "\n" in m.group(0) else " ", text)
+
+
+class Report:
+    """Bytes before / after per section of the page."""
+
+    def __init__(self):
+        self.sections = {}
+
+    def add(self, name, before, after):
+        b, a = self.sections.get(name, (0, 0))
+        self.sections[name] = (b + len(before.encode()), a + len(after.encode()))
+
+    def lines(self):
+        for name, (before, after) in self.sections.items():
+            saved = 100 * (before - after) / before if before else 0
+            yield f"  {name:<12} {before / 1024:7.1f} KB → {after / 1024:6.1f} KB  (-{saved:.0f}%)"
+
+
+def minify_html(html, keep, animations, report):
+    out = []
+    last = 0
+    for m in _RAW.finditer(html):
+        markup = html[last:m.start()]
+        out.append(_collapse_text(markup))
+        report.add("markup", markup, out[-1])
+        last = m.end()
+        if m.group(1) is None:
+            if m.group(5).startswith("[if"):         # 條件註解
+                out.append(m.group(0))
+            continue
+        tag, name, body, close = m.group(1), m.group(2).lower(), m.group(3), m.group(4)
+        if name == "style":
+            small = csslib.minify(body, keep, animations)[0]
+            report.add("inline CSS", body, small)
+        elif name == "script" and "src=" not in tag and "type=" not in tag:
+            small = minify_js(body)
+            report.add("inline JS", body, small)
+        else:
+            small = body
+        out.append(_collapse_text(tag) + small + close)
+    out.append(_collapse_text(html[last:]))
+    report.add("markup", html[last:], out[-1])
+    return "".join(out)
+
+
+def run(site):
+    vocab = csslib.Vocabulary(site.html)
+
+    def keep(selector):
+        return csslib.selector_matches(selector, vocab)
+
+    readable_dir = os.path.join(site.cache_dir, "readable")
+    os.makedirs(readable_dir, exist_ok=True)
+    report = Report()
+
+    stylesheet = site.files.get(STYLESHEET)
+    if isinstance(stylesheet, bytes):
+        source = stylesheet.decode("utf-8")
+        animations = csslib.animation_names(source, keep)
+        small, marks = csslib.minify(source, keep, animations)
+        site.files[STYLESHEET + ".map"] = json.dumps(
+            csslib.source_map(marks, source, STYLESHEET, STYLESHEET),
+            ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        site.files[STYLESHEET] = ("%s\n/*# sourceMappingURL=%s.map */\n"
+                                  % (small, STYLESHEET)).encode("utf-8")
+        report.add(STYLESHEET, source, small)
+        with open(os.path.join(readable_dir, STYLESHEET), "w", encoding="utf-8") as f:
+            f.write(source)
+    else:
+        animations = None
+
+    with open(os.path.join(readable_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(site.html)
+    site.html = minify_html(site.html, keep, animations, report)
+
+    site.log("Minified:")
+    for line in report.lines():
+        site.log(line)
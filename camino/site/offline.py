@@ -0,0 +1,199 @@
+"""
+離線瀏覽（service worker）
+簡報最後一頁的 QR code 會讓整個會場的手機同時打開網站，場地的 Wi-Fi 又常常不穩；
+這一步寫出 sw.js，第一次造訪後再開、重新整理或斷線時都直接從手機上的快取載入。
+
+- 預先快取（precache）：index.html、樣式表與 favicon。清單依 asset-manifest.json 的
+  內容雜湊產生，寫在 sw.js 裡；內容一變 sw.js 就跟著變，瀏覽器便會安裝新版本。
+  檔名含雜湊的檔案在舊版快取裡已有的直接沿用，不重新下載。
+- 照片：頁面載入後，依每張照片在版面上的寬度 × devicePixelRatio，從 srcset 挑出
+  這支手機會用的檔案（格式與瀏覽器實際選用的相同，還沒捲到的 lazy 圖片也算），
+  交給 service worker 存進 camino-images。只收這次建置頁面上引用的檔案，
+  新版本啟用時把已不再引用的刪掉。
+- index.html 先回快取中的版本，同時在背景向伺服器確認（stale-while-revalidate）；
+  其他檔名含內容雜湊的檔案（包括燈箱的大圖）一律先查快取，沒有才下載並存起來。
+- sw.js 本身不加雜湊，網址必須固定；nginx 與 index.html 一樣每次確認（no-cache）。
+  /deck.pptx 等其他請求不經過快取。
+"""
+import hashlib
+import json
+import re
+
+from .fingerprint import HASH_LEN, content_hash
+from .minify import minify_js
+
+WORKER = "sw.js"
+# 除了 index.html 以外一起預先快取的檔案類型
+CORE_EXTS = (".css", ".svg", ".js", ".woff2")
+# 執行期快取（燈箱大圖等）最多保留幾個檔案
+RUNTIME_MAX = 120
+# index.html 裡的圖片路徑（src、srcset、data-lightbox）
+_IMAGE_PATH = re.compile(r"img/[\w.-]+")
+
+# 放在 </body> 前：頁面載入完才註冊，不和首次載入搶頻寬
+REGISTER = """\
+<script>
+if ('serviceWorker' in navigator) {
+  addEventListener('load', () => {
+    navigator.serviceWorker.register('sw.js').then(() => navigator.serviceWorker.ready).then((reg) => {
+      const imgs = Array.from(document.querySelectorAll('picture img'));
+      const shown = imgs.find(i => i.currentSrc);
+      if (!shown || !reg.active) return;
+      // 與瀏覽器已選用的同一種格式；還沒載入的照片依版面寬度 × 像素密度從 srcset 挑
+      const type = { avif: 'image/avif', webp: 'image/webp' }[shown.currentSrc.split('.').pop()];
+      const urls = imgs.map((img) => {
+        if (img.currentSrc) return img.currentSrc;
+        const source = type && img.parentElement.querySelector('source[type="' + type + '"]');
+        const candidates = ((source || img).getAttribute('srcset') || '').split(',')
+          .map(c => c.trim().split(/\\s+/)).filter(c => c[0]);
+        const need = img.getBoundingClientRect().width * (window.devicePixelRatio || 1);
+        const pick = candidates.find(c => parseInt(c[1], 10) >= need) || candidates[candidates.length - 1];
+        return pick && new URL(pick[0], location.href).href;
+      }).filter(Boolean);
+      reg.active.postMessage({ images: urls });
+    }).catch(() => {});
+  });
+}
+</script>
+"""
+
+SERVICE_WORKER = """\
+// 由 python -m camino site 產生（camino/site/offline.py），請勿手改
+const VERSION = '__VERSION__';
+const PRECACHE = 'camino-precache-' + VERSION;
+const IMAGE_CACHE = 'camino-images';
+const RUNTIME = 'camino-runtime';
+const RUNTIME_MAX = __RUNTIME_MAX__;
+// [{url, revision}]；檔名已含內容雜湊的 revision 為 null
+const CORE = __CORE__;
+// 頁面上引用的所有圖片；頁面回報的照片只收這些
+const IMAGES = new Set(__IMAGES__);
+const HASHED = /\\.[0-9a-f]{__HASH_LEN__}\\.[a-z0-9]+$/;
+const SCOPE = new URL(self.registration.scope).pathname;
+
+async function precache(cache, entries) {
+  await Promise.all(entries.map(async ({ url, revision }) => {
+    if (await cache.match(url)) return;
+    // 內容雜湊相同的檔案內容必定相同，其他快取裡有就直接沿用；沒有雜湊的一定重新確認
+    let response = revision === null ? await caches.match(url) : undefined;
+    if (!response) response = await fetch(url, revision === null ? {} : { cache: 'no-cache' });
+    if (response.ok) await cache.put(url, response);
+  }));
+}
+
+function scopePath(url) {
+  const path = new URL(url, self.registration.scope).pathname;
+  return path.startsWith(SCOPE) ? path.slice(SCOPE.length) : null;
+}
+
+self.addEventListener('install', (event) => {
+  event.waitUntil((async () => {
+    await precache(await caches.open(PRECACHE), CORE);
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    for (const name of await caches.keys()) {
+      if (name.startsWith('camino-precache-') && name !== PRECACHE) await caches.delete(name);
+    }
+    const images = await caches.open(IMAGE_CACHE);
+    for (const request of await images.keys()) {
+      if (!IMAGES.has(scopePath(request.url))) await images.delete(request);
+    }
+    await self.clients.claim();
+  })());
+});
+
+self.addEventListener('message', (event) => {
+  const urls = (event.data && event.data.images) || [];
+  const entries = urls.map(scopePath).filter(p => IMAGES.has(p)).map(url => ({ url, revision: null }));
+  if (!entries.length) return;
+  event.waitUntil(caches.open(IMAGE_CACHE).then(cache => precache(cache, entries)));
+});
+
+// 先回快取中的頁面，背景取得新版存起來，下次開啟時使用
+function staleWhileRevalidate(event) {
+  const network = fetch(event.request).then(async (response) => {
+    if (response.ok) {
+      const copy = response.clone();
+      await (await caches.open(PRECACHE)).put('index.html', copy);
+    }
+    return response;
+  });
+  event.waitUntil(network.catch(() => {}));
+  return caches.open(PRECACHE)
+    .then(cache => cache.match('index.html'))
+    .then(cached => cached || network);
+}
+
+async function trim(cache) {
+  const keys = await cache.keys();
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - RUNTIME_MAX)).map(k => cache.delete(k)));
+}
+
+// 檔名含內容雜湊的檔案永遠不會變：快取有就用，沒有才下載並存進執行期快取
+async function cacheFirst(event) {
+  const cached = await caches.match(event.request);
+  if (cached) return cached;
+  const response = await fetch(event.request);
+  if (response.ok) {
+    const cache = await caches.open(RUNTIME);
+    await cache.put(event.request, response.clone());
+    event.waitUntil(trim(cache));
+  }
+  return response;
+}
+
+self.addEventListener('fetch', (event) => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+  if (url.origin !== location.origin) return;
+  if (request.mode === 'navigate' && (url.pathname === SCOPE || url.pathname === SCOPE + 'index.html')) {
+    event.respondWith(staleWhileRevalidate(event));
+  } else if (url.pathname.startsWith(SCOPE) && HASHED.test(url.pathname)) {
+    event.respondWith(cacheFirst(event));
+  }
+});
+"""
+
+
+def precache_manifest(site):
+    """(core [{url, revision}], [every image path the page references]) for the built page.
+
+    Run after the last fingerprint pass: every path is final, and index.html is
+    the last file to change.
+    """
+    hashed = set(site.manifest.values())
+    core = [{"url": "index.html", "revision": content_hash(site.html.encode("utf-8"))}]
+    core += [{"url": path, "revision": None} for path in sorted(hashed)
+             if path.endswith(CORE_EXTS) and not path.startswith("img/") and path in site.files]
+    images = sorted(p for p in set(_IMAGE_PATH.findall(site.html)) if p in site.files)
+    return core, images
+
+
+def service_worker(core, images):
+    """Source of sw.js precaching `core` and caching the page's choice among `images`."""
+    version = hashlib.sha256(json.dumps([core, images], sort_keys=True).encode("utf-8"))
+    replacements = {
+        "__VERSION__": version.hexdigest()[:HASH_LEN],
+        "__RUNTIME_MAX__": str(RUNTIME_MAX),
+        "__CORE__": json.dumps(core, separators=(",", ":")),
+        "__IMAGES__": json.dumps(images, separators=(",", ":")),
+        "__HASH_LEN__": str(HASH_LEN),
+    }
+    js = SERVICE_WORKER
+    for key, value in replacements.items():
+        js = js.replace(key, value)
+    return minify_js(js) + "\n"
+
+
+def run(site):
+    # 註冊的 script 也是 index.html 的內容，要在算它的 revision 之前加上
+    site.html = site.html.replace("</body>", minify_js(REGISTER) + "</body>", 1)
+    core, images = precache_manifest(site)
+    site.files[WORKER] = service_worker(core, images).encode("utf-8")
+    site.log(f"Service worker: {len(core)} files precached; the page's photos are cached "
+             f"in the size and format each device picks ({len(images)} candidates).")
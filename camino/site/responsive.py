@@ -0,0 +1,204 @@
+"""
+響應式圖片
+img/ 裡每張照片產生多種寬度的 AVIF / WebP / JPEG，並把 index.html 的
+<img src="img/NN.jpg"> 改寫成 <picture> + srcset / sizes，附上 width / height，
+手機只下載版面實際需要的大小。
+"""
+import os
+import re
+from collections import namedtuple
+
+from ..media import _open_rgb, _save_jpeg, render_jobs
+from .markup import attr, find_images, splice
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+# (副檔名, MIME, 品質)；AVIF / WebP 只在 Pillow 支援時產生
+FORMATS = (("avif", "image/avif", 50), ("webp", "image/webp", 72), ("jpg", "image/jpeg", 80))
+PHOTO_EXTS = (".jpg", ".jpeg")
+# 沒有 sizes 屬性的圖片，依最近的祖先 class 推算它在版面上的寬度（見 index.html 的 CSS）
+SIZES = {
+    "intro-img": "(max-width: 768px) calc(100vw - 4rem), 420px",
+    "timeline-img-wrapper": "(max-width: 900px) calc(100vw - 8rem), 470px",
+    "three-cols": "(max-width: 600px) calc(100vw - 8rem), (max-width: 900px) calc(33vw - 3rem), 160px",
+    "timeline-gallery": "(max-width: 900px) calc(50vw - 4rem), 235px",
+    "full-break": "100vw",
+    "gallery-item": "(max-width: 600px) 50vw, 420px",
+}
+DEFAULT_SIZES = "100vw"
+# 可點開燈箱的圖片：頁面上只給到 GRID_MAX 寬，更大的尺寸另列為燈箱用（data-lightbox）
+LIGHTBOX = ("gallery-item", "timeline-img-wrapper", "timeline-gallery")
+GRID_MAX = 960
+# 只寫 src 的瀏覽器拿到的 JPEG 寬度
+FALLBACK_WIDTH = 960
+
+# sources: {副檔名: [(寬度, dist 內的路徑)]}，由小到大
+Picture = namedtuple("Picture", "name width height sources")
+
+
+def available_formats():
+    from PIL import features
+    return [f for f in FORMATS if f[0] == "jpg" or features.check(f[0])]
+
+
+def widths_for(src_w):
+    """Target widths for a source `src_w` px wide; never upscales."""
+    widths = [w for w in WIDTHS if w < src_w]
+    return widths + [min(src_w, WIDTHS[-1])]
+
+
+def encode(src, dst, size, quality):
+    """Resize `src` to `size` and write it in the format named by `dst`'s extension."""
+    from PIL import Image
+    im = _open_rgb(src, size)
+    if im.size != size:
+        im = im.resize(size, Image.LANCZOS)
+    ext = os.path.splitext(dst)[1]
+    if ext == ".jpg":
+        _save_jpeg(im, dst, quality)
+        return
+    tmp = "%s.%d.tmp" % (dst, os.getpid())
+    if ext == ".webp":
+        im.save(tmp, "WEBP", quality=quality, method=6)
+    else:
+        # speed 8：編碼快三倍，檔案只大約 5%
+        im.save(tmp, "AVIF", quality=quality, speed=8)
+    os.replace(tmp, dst)
+
+
+def jobs(site):
+    """Render jobs for every derivative missing from the cache; fills site.pictures."""
+    formats = available_formats()
+    queued = []
+    for name in sorted(os.listdir(site.index.root)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in PHOTO_EXTS:
+            continue
+        src = os.path.join(site.index.root, name)
+        width, height = site.index.size(name)
+        digest = site.index.digest(name)[:20]
+        sources = {}
+        for fmt, _, quality in formats:
+            sources[fmt] = []
+            for w in widths_for(width):
+                path = "img/%s-%d.%s" % (stem, w, fmt)
+                if fmt == "jpg" and w == width:
+                    # 原尺寸的 JPEG 就是原檔，重新壓縮只會更大
+                    site.files[path] = src
+                    sources[fmt].append((w, path))
+                    continue
+                size = (w, max(1, round(height * w / width)))
+                cached = os.path.join(site.cache_dir, "%s-%dw-q%d.%s" % (digest, w, quality, fmt))
+                if not os.path.exists(cached):
+                    queued.append((encode, src, cached, size, quality))
+                site.files[path] = cached
+                sources[fmt].append((w, path))
+        site.pictures[name] = Picture(name, width, height, sources)
+    return queued
+
+
+def render(site):
+    """Render every derivative missing from the cache; fills site.pictures."""
+    return render_jobs(jobs(site), site.jobs)
+
+
+# ══════════════════════════════════════════════════════════════
+# HTML rewriting
+# ══════════════════════════════════════════════════════════════
+
+def sizes_for(ancestors):
+    for element in ancestors:
+        for cls in element.classes:
+            if cls in SIZES:
+                return SIZES[cls]
+    return DEFAULT_SIZES
+
+
+def in_lightbox(ancestors):
+    return any(cls in LIGHTBOX for element in ancestors for cls in element.classes)
+
+
+def _srcset(candidates):
+    return ", ".join("%s %dw" % (path, w) for w, path in candidates)
+
+
+def tiers(candidates):
+    """Split (width, path) `candidates` into the grid tier and the lightbox tier."""
+    grid = [c for c in candidates if c[0] <= GRID_MAX] or candidates[:1]
+    large = [c for c in candidates if c[0] > GRID_MAX] or candidates[-1:]
+    return grid, large
+
+
+def picture_markup(picture, attrs, sizes, lightbox=False):
+    """<picture> replacing an <img> with attributes `attrs` (a list of pairs).
+
+    With `lightbox`, the page only gets the grid tier; the larger widths go into
+    data-lightbox as "MIME srcset" entries separated by "|", best format first.
+    """
+    sources = ""
+    large = []
+    for fmt, mime, _ in FORMATS:
+        if fmt not in picture.sources:
+            continue
+        candidates = picture.sources[fmt]
+        if lightbox:
+            candidates, top = tiers(candidates)
+            large.append("%s %s" % (mime, _srcset(top)))
+        if fmt != "jpg":
+            sources += "<source type=\"%s\"%s%s>" % (
+                mime, attr("srcset", _srcset(candidates)), attr("sizes", sizes))
+    jpegs = picture.sources["jpg"]
+    if lightbox:
+        jpegs = tiers(jpegs)[0]
+    fallback = [p for w, p in jpegs if w <= FALLBACK_WIDTH][-1:] or [jpegs[0][1]]
+    w, h = jpegs[-1][0], round(picture.height * jpegs[-1][0] / picture.width)
+    img = "<img" + attr("src", fallback[0]) + attr("srcset", _srcset(jpegs)) + attr("sizes", sizes)
+    img += attr("width", str(w)) + attr("height", str(h))
+    if large:
+        img += attr("data-lightbox", "|".join(large))
+    for name, value in attrs:
+        if name not in ("src", "srcset", "sizes", "width", "height"):
+            img += attr(name, value)
+    if "decoding" not in dict(attrs):
+        img += attr("decoding", "async")
+    return "<picture>%s%s></picture>" % (sources, img)
+
+
+def rewrite(html, pictures):
+    """Swap each <img src="img/…"> in `html` for a responsive <picture>."""
+    edits = []
+    for img in find_images(html):
+        src = dict(img.attrs).get("src") or ""
+        picture = pictures.get(src[4:]) if src.startswith("img/") else None
+        if picture is None:
+            continue
+        sizes = dict(img.attrs).get("sizes") or sizes_for(img.ancestors)
+        edits.append((img.offset, len(img.text),
+                      picture_markup(picture, img.attrs, sizes, in_lightbox(img.ancestors))))
+    html = splice(html, edits)
+
+    # CSS 背景圖：保留最大的 JPEG，另加 image-set() 讓瀏覽器挑 AVIF / WebP；
+    # 不支援 image-set() type() 的瀏覽器會略過後一個宣告，照舊用 JPEG
+    for name, picture in pictures.items():
+        largest = [(mime, picture.sources[fmt][-1][1]) for fmt, mime, _ in FORMATS
+                   if fmt in picture.sources]
+        image_set = "image-set(%s)" % ", ".join('url("%s") type("%s")' % (path, mime)
+                                                for mime, path in largest)
+        jpeg = picture.sources["jpg"][-1][1]
+        background = re.compile(r"url\((['\"]?)img/%s\1\)([^;}]*);?" % re.escape(name))
+        html = background.sub(lambda m: "url(%s%s%s)%s; background-image: %s;" % (
+            m.group(1), jpeg, m.group(1), m.group(2), image_set), html)
+        # 預先載入只取最好的格式（帶 type，不支援的瀏覽器直接略過，不會重複下載）
+        preload = re.compile(r'(<link\b[^>]*\brel="preload"[^>]*?)\shref="img/%s"' % re.escape(name))
+        html = preload.sub(lambda m: '%s href="%s" type="%s"' % (
+            m.group(1), largest[0][1], largest[0][0]), html)
+
+    # <picture> 不產生自己的 box，<img> 照舊是 grid / flex 的子元素
+    return html.replace("</style>", "    picture { display: contents; }\n  </style>", 1)
+
+
+def run(site):
+    rendered = render(site)
+    site.html = rewrite(site.html, site.pictures)
+    count = sum(len(v) for p in site.pictures.values() for v in p.sources.values())
+    site.log(f"Responsive images: {len(site.pictures)} photos, {count} derivatives "
+             f"({rendered} rendered).")
@@ -0,0 +1,107 @@
+"""
+投影片快取
+每張投影片組好後，把 slide XML 與它引用的圖片存進 .cache/slides/；
+下次建置時若 builder 的輸入（程式碼、文字、座標、轉場、圖片內容）都沒變，
+就直接還原 XML 與圖片，不必重新排版或處理圖片。
+"""
+import hashlib
+import json
+import os
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+
+from .pptx_writer import REL_ATTRS, detach_blob
+
+
+class SlideCache:
+    """Content-addressed store of built slides, validated against image digests."""
+
+    def __init__(self, cache_dir, index):
+        self.cache_dir = cache_dir
+        self.media_dir = os.path.join(cache_dir, "media")
+        self.index = index
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".xml", base + ".json"
+
+    def restore(self, key, slide):
+        """Fill the empty `slide` from the cache; False when missing or stale."""
+        xml_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(xml_path, "rb") as f:
+                cached = parse_xml(f.read())
+        except (OSError, ValueError, etree.XMLSyntaxError):
+            return False
+        try:
+            if any(self.index.digest(name) != sha1 for name, sha1 in meta["images"].items()):
+                return False
+        except OSError:
+            return False
+
+        # 圖片全部都在才開始加 part：中途放棄的話投影片會重建，加過的圖片就成了孤兒
+        paths = {old_rid: os.path.join(self.media_dir, media)
+                 for old_rid, media in meta["media"].items()}
+        if not all(os.path.exists(path) for path in paths.values()):
+            return False
+
+        # Re-add the media parts and map the cached rIds onto the new ones
+        rids = {}
+        try:
+            for old_rid, path in paths.items():
+                part, rids[old_rid] = slide.part.get_or_add_image_part(path)
+                detach_blob(part, path)
+        except OSError:
+            # 檢查之後才被刪掉或讀不到：拿掉已加上的關聯，沒有引用的圖片就不會寫進簡報
+            for rid in set(rids.values()):
+                slide.part.drop_rel(rid)
+            return False
+        for el in cached.iter():
+            for attr in REL_ATTRS:
+                rid = el.get(attr)
+                if rid in rids:
+                    el.set(attr, rids[rid])
+
+        sld = slide._element
+        for child in list(sld):
+            sld.remove(child)
+        for child in list(cached):
+            sld.append(child)
+        return True
+
+    def store(self, key, slide, images):
+        """Save `slide` under `key`; `images` are the source names it was built from."""
+        os.makedirs(self.media_dir, exist_ok=True)
+        media = {}
+        for rel in slide.part.rels.values():
+            if rel.reltype != RT.IMAGE:
+                continue
+            part = rel.target_part
+            name = "%s.%s" % (part.sha1, part.partname.ext)
+            path = os.path.join(self.media_dir, name)
+            if not os.path.exists(path):
+                _write_atomic(path, part.blob)
+            media[rel.rId] = name
+
+        meta = {"images": {name: self.index.digest(name) for name in sorted(set(images))},
+                "media": media}
+        xml_path, meta_path = self._paths(key)
+        # XML 先寫、meta 後寫：其他 process 看到 meta 時 XML 一定已經完整
+        _write_atomic(xml_path, etree.tostring(slide._element))
+        _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+
+def _write_atomic(path, data):
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def builder_key(source, fingerprint):
+    """Cache key of one slide builder: its own source plus the shared fingerprint."""
+    return hashlib.sha1((fingerprint + "\0" + source).encode("utf-8")).hexdigest()
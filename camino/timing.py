@@ -0,0 +1,122 @@
+"""
+建置計時
+build 流程在各階段以 span() 標記；沒有 record() 時只多一次全域變數檢查，
+平常建置幾乎沒有額外成本。benchmark（camino/bench.py）用它分開計算各階段的時間，
+`build --profile` 則用 profile() 把整次建置寫成 Chrome / Perfetto 可開啟的 trace。
+"""
+import json
+import os
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+# 一段時間：名稱、開始 / 結束（perf_counter 秒）、附加資訊（例如投影片名稱）
+Span = namedtuple("Span", "name start end args")
+
+SPANS = None
+# profile(memory=True) 在每個 span 結束時呼叫，記錄當下的記憶體用量
+_ON_END = None
+
+
+@contextmanager
+def span(name, **args):
+    """Time the block as `name` while a record() is active."""
+    if SPANS is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        SPANS.append(Span(name, start, time.perf_counter(), args))
+        if _ON_END is not None:
+            _ON_END(name)
+
+
+@contextmanager
+def record():
+    """Collect the spans of the enclosed block into the yielded list."""
+    global SPANS
+    outer, SPANS = SPANS, []
+    try:
+        yield SPANS
+    finally:
+        SPANS = outer
+
+
+def totals(spans):
+    """Seconds per span name; nested spans are also counted in their parents."""
+    out = {}
+    for s in spans:
+        out[s.name] = out.get(s.name, 0.0) + s.end - s.start
+    return out
+
+
+def chrome_trace(spans, memory=()):
+    """Trace Event Format dict (chrome://tracing, ui.perfetto.dev) of `spans`.
+
+    `memory` is [(perf_counter time, traced bytes)], shown as a counter track.
+    """
+    origin = min((s.start for s in spans), default=0.0)
+    pid = os.getpid()
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 1,
+               "args": {"name": "camino build"}}]
+    # 外層的 span 先結束才寫入，依開始時間排序後巢狀關係才會正確
+    for s in sorted(spans, key=lambda s: (s.start, s.start - s.end)):
+        events.append({"name": s.name, "ph": "X", "pid": pid, "tid": 1,
+                       "ts": round((s.start - origin) * 1e6, 1),
+                       "dur": round((s.end - s.start) * 1e6, 1), "args": s.args})
+    for t, traced in memory:
+        events.append({"name": "memory", "ph": "C", "pid": pid, "tid": 1,
+                       "ts": round((t - origin) * 1e6, 1), "args": {"traced MB": round(traced / 2**20, 2)}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+@contextmanager
+def profile(out_dir, python=False, memory=False):
+    """Record the enclosed block and write its profile into `out_dir`.
+
+    Always writes trace.json; `python` adds a cProfile dump (build.prof, for
+    pstats / snakeviz) and `memory` a memory counter track in the trace plus
+    a tracemalloc snapshot taken right after the save, while the whole deck
+    is still in memory (memory.tracemalloc, tracemalloc.Snapshot.load).
+    Yields the list the written paths are added to.
+    """
+    import cProfile
+    import tracemalloc
+    global _ON_END
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    samples = []
+    snapshot = []
+
+    def on_end(name):
+        samples.append((time.perf_counter(), tracemalloc.get_traced_memory()[0]))
+        if name == "save":
+            snapshot[:] = [tracemalloc.take_snapshot()]
+
+    profiler = cProfile.Profile() if python else None
+    if memory:
+        tracemalloc.start(25)
+        _ON_END = on_end
+    if profiler:
+        profiler.enable()
+    try:
+        with record() as spans:
+            yield written
+    finally:
+        if profiler:
+            profiler.disable()
+            path = os.path.join(out_dir, "build.prof")
+            profiler.dump_stats(path)
+            written.append(path)
+        if memory:
+            _ON_END = None
+            path = os.path.join(out_dir, "memory.tracemalloc")
+            (snapshot[0] if snapshot else tracemalloc.take_snapshot()).dump(path)
+            tracemalloc.stop()
+            written.append(path)
+        path = os.path.join(out_dir, "trace.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(chrome_trace(spans, samples), f, ensure_ascii=False)
+        written.insert(0, path)